@@ -0,0 +1,204 @@
+import itertools
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from instrumentation import to_jsonl, to_openmetrics
+from core import crawl, entries_to_dict, options_from_dict, results_to_dict, scrape_urls, scrape_wikipedia_data
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+JOB_WORKERS = 2
+MAX_FINISHED_JOBS = 200
+
+# Expected JSON type of each optional field; anything else is answered with 400 before a job is queued
+OPTION_TYPES = {"headlines": "strings", "tags": "strings", "links": bool, "media": bool, "paragraphs": bool}
+PAYLOAD_TYPES = {"url": str, "seed": str, "urls": "strings", "options": dict, "browser_domains": "strings",
+                 "readiness": dict, "parser": str, "scope": dict, "resume": bool}
+TYPE_NAMES = {str: "a string", bool: "a boolean", dict: "an object", "strings": "a list of strings"}
+
+
+def _type_error(values, types, where=""):
+    for key, expected in types.items():
+        value = values.get(key)
+        if value is None:
+            continue
+        if expected == "strings":
+            # A bare string would otherwise be iterated character by character
+            valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+        else:
+            valid = isinstance(value, expected)
+        if not valid:
+            return f"'{where}{key}' must be {TYPE_NAMES[expected]}"
+    return None
+
+
+def validate_payload(payload):
+    error = _type_error(payload, PAYLOAD_TYPES)
+    if error is None and payload.get("options"):
+        error = _type_error(payload["options"], OPTION_TYPES, "options.")
+    return error
+
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS):
+        self.jobs = {}
+        self._queue = queue.Queue()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        for _ in range(workers):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def submit(self, kind, payload):
+        job = {"id": str(next(self._ids)), "kind": kind, "status": "queued", "done": 0, "total": 0,
+               "submitted": time.time(), "started": None, "finished": None, "error": None, "results": None}
+        with self._lock:
+            self.jobs[job["id"]] = job
+            self._prune()
+        self._queue.put((job, payload))
+        return job
+
+    def get(self, job_id):
+        # Handler threads read jobs through these while submit() prunes finished ones
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._lock:
+            return list(self.jobs.values())
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if job["status"] in ("done", "failed")]
+        for job in sorted(finished, key=lambda j: j["finished"])[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job["id"]]
+
+    def _work(self):
+        while True:
+            job, payload = self._queue.get()
+            job["status"] = "running"
+            job["started"] = time.time()
+
+            def progress(done, total, url):
+                job["done"], job["total"] = done, total
+
+            try:
+                options = options_from_dict(payload.get("options", {}))
+                settings = {
+                    "browser_domains": payload.get("browser_domains", ()),
+                    "readiness": payload.get("readiness"),
+                    "parser": payload.get("parser"),
+                    "progress": progress,
+                }
+                if job["kind"] == "crawl":
+                    entries = crawl(payload["seed"], options, payload.get("scope"), resume=payload.get("resume", True), **settings)
+                else:
+                    job["total"] = len(payload["urls"])
+                    entries = scrape_urls(payload["urls"], options, **settings)
+                job["results"] = entries_to_dict(entries)
+                status = "done"
+            except Exception as e:
+                job["error"] = str(e)
+                status = "failed"
+            # finished goes in before the status: _prune sorts every done or failed job by it
+            job["finished"] = time.time()
+            job["status"] = status
+
+    def summary(self, job):
+        return {key: value for key, value in job.items() if key != "results"}
+
+
+class ScrapeHandler(BaseHTTPRequestHandler):
+    jobs = None
+
+    def _send(self, status, body):
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_text(self, content_type, text):
+        data = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        job = self.jobs.get(parts[1]) if len(parts) in (2, 3) and parts[0] == "jobs" else None
+        if parts == ["jobs"]:
+            self._send(200, [self.jobs.summary(job) for job in self.jobs.list_jobs()])
+        elif job is not None:
+            if len(parts) == 3 and parts[2] == "results":
+                if job["status"] != "done":
+                    self._send(409, {"error": f"Job is {job['status']}"})
+                else:
+                    self._send(200, job["results"])
+            else:
+                self._send(200, self.jobs.summary(job))
+        elif parts == ["health"]:
+            self._send(200, {"status": "ok"})
+        elif parts == ["metrics"]:
+            self._send_text("application/openmetrics-text; version=1.0.0; charset=utf-8", to_openmetrics())
+        elif parts == ["traces"]:
+            self._send_text("application/x-ndjson", to_jsonl())
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+        except (ValueError, UnicodeDecodeError):
+            self._send(400, {"error": "Request body must be JSON"})
+            return
+        if not isinstance(payload, dict):
+            self._send(400, {"error": "Request body must be a JSON object"})
+            return
+        error = validate_payload(payload)
+        if error:
+            self._send(400, {"error": error})
+            return
+        path = self.path.split("?")[0].rstrip("/")
+        if path == "/scrape":
+            # Synchronous single-page scrape
+            if not payload.get("url"):
+                self._send(400, {"error": "Missing 'url'"})
+                return
+            *results, _, error = scrape_wikipedia_data(payload["url"], *options_from_dict(payload.get("options", {})),
+                                                    payload.get("browser_domains", ()), payload.get("readiness"), payload.get("parser"))
+            if error:
+                self._send(502, {"error": error})
+            else:
+                self._send(200, results_to_dict(results))
+        elif path == "/jobs":
+            if payload.get("seed"):
+                job = self.jobs.submit("crawl", payload)
+            elif payload.get("urls"):
+                job = self.jobs.submit("batch", payload)
+            else:
+                self._send(400, {"error": "Provide 'urls' for a batch job or 'seed' for a crawl"})
+                return
+            self._send(202, self.jobs.summary(job))
+        else:
+            self._send(404, {"error": "Not found"})
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=JOB_WORKERS):
+    ScrapeHandler.jobs = JobQueue(workers)
+    server = ThreadingHTTPServer((host, port), ScrapeHandler)
+    print(f"Scraping API listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,130 @@
+import multiprocessing
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from extractors import extract_page
+from fetcher import fetch_page, host_of, render_reason
+from instrumentation import span, trace
+from parsers import default_backend, parse_html
+
+FETCH_WORKERS = 4
+PARSE_WORKERS = 2
+HOST_INTERVAL = 1.0
+RETRIES = 2
+BACKOFF = 1.0
+
+
+class HostRateLimiter:
+    def __init__(self, min_interval=HOST_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        # Reserve the next free slot for this host, then sleep outside the lock
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def parse_urls(text):
+    urls = []
+    for line in text.splitlines():
+        for part in line.replace(",", " ").split():
+            if part.startswith(("http://", "https://")):
+                urls.append(part)
+    return list(dict.fromkeys(urls))
+
+
+def fetch_with_retries(url, selectors, browser_domains, readiness, limiter, retries=RETRIES, backoff=BACKOFF, parser=None, use_cache=True,
+                       render_profile=None, cache_ttl=None, reason=None):
+    # Parsing happens in the process pool, so a batch trace covers the fetch side only; that includes the
+    # selector check on HTTP responses (see check_page_html), which fetch_page is told to skip
+    with trace("batch.fetch", url=url):
+        attempt = 0
+        while True:
+            with span("batch.host_wait"):
+                limiter.wait(host_of(url))
+            try:
+                html, _, record = fetch_page(url, selectors, browser_domains, readiness, parser, use_cache, render_profile, cache_ttl,
+                                             check=False, reason=reason)
+                record["attempts"] = attempt + 1
+                return html, record
+            except Exception:
+                if attempt >= retries:
+                    raise
+                time.sleep(backoff * (2 ** attempt) + random.uniform(0, backoff))
+                attempt += 1
+
+
+def check_page_html(html, record, selectors, parser=None):
+    # Runs in the parse pool: the document and render_reason() for pages that came over HTTP, where a
+    # non-empty reason sends the page back to the fetch pool for the browser
+    document = parse_html(html, parser or default_backend())
+    reason = render_reason(html, document, selectors) if record["method"] == "http" else ""
+    return document, reason
+
+
+def check_and_extract(html, record, options, selectors=(), parser=None):
+    document, reason = check_page_html(html, record, selectors, parser)
+    return (None if reason else extract_page(document, *options)), reason
+
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool(workers=PARSE_WORKERS):
+    # Spawned rather than forked: Streamlit runs threads, and Windows has no fork anyway
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _parse_pool
+
+
+def run_batch(urls, options, selectors=(), browser_domains=(), readiness=None, fetch_workers=FETCH_WORKERS,
+              host_interval=HOST_INTERVAL, retries=RETRIES, progress=None, parser=None, use_cache=True, render_profile=None, cache_ttl=None):
+    limiter = HostRateLimiter(host_interval)
+    parse_pool = get_parse_pool()
+    results = {url: {"result": None, "error": None, "fetch": None} for url in urls}
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool:
+        pending = {}
+        for url in urls:
+            future = fetch_pool.submit(fetch_with_retries, url, selectors, browser_domains, readiness, limiter, retries, BACKOFF, parser, use_cache,
+                                       render_profile, cache_ttl)
+            pending[future] = (url, "fetch")
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                url, stage = pending.pop(future)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    results[url]["error"] = f"Error occurred during {stage}: {str(e)}"
+                else:
+                    if stage == "fetch":
+                        html, record = value
+                        results[url]["fetch"] = record
+                        pending[parse_pool.submit(check_and_extract, html, record, options, selectors, parser)] = (url, "parse")
+                        continue
+                    result, reason = value
+                    if reason:
+                        future = fetch_pool.submit(fetch_with_retries, url, selectors, browser_domains, readiness, limiter, retries, BACKOFF,
+                                                   parser, use_cache, render_profile, cache_ttl, reason)
+                        pending[future] = (url, "fetch")
+                        continue
+                    results[url]["result"] = result
+                done += 1
+                if progress:
+                    progress(done, len(urls), url)
+
+    return results
@@ -0,0 +1,57 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.corpus import load_page
+from extractors import (extract_page, scrape_headlines_func, scrape_links_func, scrape_media_func, scrape_p_tags_func,
+                        scrape_tables, scrape_tags_func)
+
+# Extractor configurations with an increasing number of enabled extractors
+CONFIGS = [
+    ("tables", (False, [], False, False, [], False)),
+    ("+paragraphs", (False, [], False, False, [], True)),
+    ("+links", (False, [], True, False, [], True)),
+    ("+media", (False, [], True, True, [], True)),
+    ("+headlines", (True, ["h1", "h2", "h3"], True, True, [], True)),
+    ("+tags", (True, ["h1", "h2", "h3"], True, True, ["p", "span", "li", "a"], True)),
+]
+REPEAT = 5
+
+
+def extract_multi_pass(soup, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags):
+    return (scrape_tables(soup), scrape_headlines_func(soup, scrape_headlines, selected_headlines_tags), scrape_links_func(soup, scrape_links),
+            scrape_media_func(soup, scrape_media), scrape_tags_func(soup, scrape_tags), scrape_p_tags_func(soup, scrape_p_tags))
+
+
+def best_of(func, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def same_output(a, b):
+    tables_a, tables_b = a[0], b[0]
+    return len(tables_a) == len(tables_b) and all(x.equals(y) for x, y in zip(tables_a, tables_b)) and a[1:] == b[1:]
+
+
+def main(size="medium"):
+    soup = BeautifulSoup(load_page(size), "html.parser")
+    print(f"page size: {size}, elements: {len(soup.find_all(True))}")
+    print(f"{'extractors':<14}{'multi-pass (ms)':>18}{'single-pass (ms)':>18}{'speedup':>10}")
+    for name, options in CONFIGS:
+        multi, expected = best_of(extract_multi_pass, soup, *options)
+        single, actual = best_of(extract_page, soup, *options)
+        if not same_output(expected, actual):
+            raise SystemExit(f"single-pass output differs from the scrape_* functions for {name}")
+        print(f"{name:<14}{multi * 1000:>18.1f}{single * 1000:>18.1f}{multi / single:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "medium")
@@ -0,0 +1,50 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import SIZES, load_page
+from extractors import extract_page
+from parsers import available_backends, parse_html
+
+OPTIONS = (True, ["h1", "h2", "h3"], True, True, ["span", "li"], True)
+REPEAT = 3
+
+
+def run(html, backend):
+    best_parse = best_extract = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        document = parse_html(html, backend)
+        parsed = time.perf_counter()
+        result = extract_page(document, *OPTIONS)
+        best_parse = min(best_parse, parsed - start)
+        best_extract = min(best_extract, time.perf_counter() - parsed)
+    return best_parse, best_extract, result
+
+
+def differences(expected, actual):
+    names = ["tables", "headlines", "links", "media", "tags", "paragraphs"]
+    diffs = []
+    if len(expected[0]) != len(actual[0]) or not all(a.equals(b) for a, b in zip(expected[0], actual[0])):
+        diffs.append(names[0])
+    diffs += [name for name, a, b in zip(names[1:], expected[1:], actual[1:]) if a != b]
+    return diffs
+
+
+def main():
+    backends = available_backends()
+    print(f"{'page':<8}{'backend':<13}{'parse (ms)':>12}{'extract (ms)':>14}{'total (ms)':>12}  output")
+    for size in SIZES:
+        html = load_page(size)
+        _, _, reference = run(html, "html.parser")
+        for backend in backends:
+            parse, extract, result = run(html, backend)
+            diffs = differences(reference, result)
+            status = "matches html.parser" if not diffs else "differs: " + ", ".join(diffs)
+            print(f"{size:<8}{backend:<13}{parse * 1000:>12.1f}{extract * 1000:>14.1f}{(parse + extract) * 1000:>12.1f}  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import REGRESSION_THRESHOLD, load_baseline, missing_baseline, save_baseline
+
+STARTUP_BASELINE_PATH = Path(__file__).resolve().parent / "startup_baseline.json"
+MARKER = "-- page run --"
+REPEAT = 3
+TOP_IMPORTS = 5
+CSV_ROWS = 20_000
+
+# Libraries that only the scraping, dataset and plotting features need
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "matplotlib", "seaborn", "selenium", "webdriver_manager", "bs4", "lxml", "requests"]
+
+# (page, view): script, sidebar widget changes applied after the landing render, heavy modules the view may load.
+# A view with changes is judged by what its own rerun imports, on top of the landing render.
+VIEWS = {
+    ("scraper", "landing"): ("scrapper.py", [], []),
+    ("analysis", "landing"): ("pages/analysis.py", [], []),
+    ("analysis", "about"): ("pages/analysis.py", [("radio", "About")], []),
+    ("analysis", "dataset"): ("pages/analysis.py", [("text_input", "{csv}")], HEAVY_MODULES),
+    # st.image imports numpy itself, for the placeholder picture
+    ("visualization", "landing"): ("pages/visualization.py", [], ["numpy"]),
+    ("visualization", "about"): ("pages/visualization.py", [("radio", "About")], []),
+}
+
+
+def write_csv(path, rows=CSV_ROWS):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "group", "value", "score"])
+        for i in range(rows):
+            writer.writerow([i, f"g{i % 7}", i * 0.5, (i * 37) % 101])
+
+
+def child(script, changes):
+    # Runs in a fresh interpreter: Streamlit's test runner is imported first, so everything
+    # imported after the marker belongs to the page itself
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / script), default_timeout=300)
+    before = set(sys.modules)
+    print(MARKER, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    app.run()
+    landing = time.perf_counter() - start
+    if changes:
+        before = set(sys.modules)
+    start = time.perf_counter()
+    for widget, value in changes:
+        getattr(app.sidebar, widget)[0].set_value(value)
+    if changes:
+        app.run()
+    view = time.perf_counter() - start if changes else landing
+    errors = [str(e.value) for e in app.exception]
+    loaded = sorted({name.split(".")[0] for name in set(sys.modules) - before})
+    print(json.dumps({"landing_ms": landing * 1000, "view_ms": view * 1000, "errors": errors,
+                      "heavy": [name for name in HEAVY_MODULES if name in loaded]}))
+
+
+def parse_importtime(stderr):
+    # -X importtime lines after the marker: "import time: self | cumulative | <indent>name", top level has one space
+    lines = stderr.split(MARKER, 1)[-1].splitlines()
+    top = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if cumulative.strip().isdigit() and name.startswith(" ") and not name.startswith("  "):
+            top.append((name.strip(), int(cumulative) / 1000))
+    return sum(ms for _, ms in top), sorted(top, key=lambda item: -item[1])
+
+
+def run_view(script, changes, csv_path):
+    changes = [(widget, value.format(csv=csv_path)) for widget, value in changes]
+    command = [sys.executable, "-X", "importtime", str(Path(__file__).resolve()), "--child", script, "--changes", json.dumps(changes)]
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"})
+    cold_start = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "child failed")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["cold_start_ms"] = cold_start * 1000
+    result["import_ms"], result["imports"] = parse_importtime(completed.stderr)
+    return result
+
+
+def measure_views(views, repeat):
+    # Imported here rather than at the top: the child runs of this script must start without pandas
+    from datasets import DATA_DIR
+
+    results = {}
+    # The analysis page only opens server-side files from the data directory
+    DATA_DIR.mkdir(exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="startup_bench_", dir=DATA_DIR) as workdir:
+        csv_path = str(Path(workdir).relative_to(DATA_DIR) / "data.csv")
+        write_csv(DATA_DIR / csv_path)
+        for (page, view), (script, changes, allowed) in views.items():
+            runs = [run_view(script, changes, csv_path) for _ in range(repeat)]
+            last = runs[-1]
+            results[f"{page}/{view}"] = {
+                "cold_start_ms": statistics.median(r["cold_start_ms"] for r in runs),
+                "landing_ms": statistics.median(r["landing_ms"] for r in runs),
+                "view_ms": statistics.median(r["view_ms"] for r in runs),
+                "import_ms": statistics.median(r["import_ms"] for r in runs),
+                "heavy": last["heavy"],
+                "unexpected": [name for name in last["heavy"] if name not in allowed],
+                "errors": last["errors"],
+                "top_imports": [name for name, _ in last["imports"][:TOP_IMPORTS]],
+            }
+    return results
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    # Slower first renders and heavy libraries showing up on light views both count as regressions
+    regressions = []
+    for name, current in results.items():
+        if current["unexpected"]:
+            regressions.append((name, "heavy imports", "-", ", ".join(current["unexpected"])))
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("cold_start_ms", "view_ms", "import_ms"):
+            if previous[metric] > 0 and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append((name, metric, f"{previous[metric]:.0f}", f"{current[metric]:.0f}"))
+    return regressions
+
+
+def format_table(results, baseline):
+    lines = [f"{'view':<26}{'cold start ms':>15}{'render ms':>11}{'page imports ms':>17}{'vs base':>9}  heavy modules / top imports"]
+    for name, r in results.items():
+        previous = baseline.get(name)
+        delta = f"{(r['cold_start_ms'] / previous['cold_start_ms'] - 1) * 100:+.0f}%" if previous and previous["cold_start_ms"] else "-"
+        detail = ", ".join(r["heavy"]) or "none"
+        lines.append(f"{name:<26}{r['cold_start_ms']:>15.0f}{r['view_ms']:>11.0f}{r['import_ms']:>17.0f}{delta:>9}  "
+                     f"{detail} / {', '.join(r['top_imports']) or '-'}")
+        for error in r["errors"]:
+            lines.append(f"{'':<26}error: {error}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start and first-render latency of each Streamlit page.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--changes", default="[]", help=argparse.SUPPRESS)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="fresh interpreters per view (median is reported)")
+    parser.add_argument("--only", help="comma-separated page names to run (scraper, analysis, visualization)")
+    parser.add_argument("--baseline", default=str(STARTUP_BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, json.loads(args.changes))
+        return
+
+    only = set(args.only.split(",")) if args.only else None
+    views = {key: value for key, value in VIEWS.items() if only is None or key[0] in only}
+    baseline = load_baseline(args.baseline)
+    results = measure_views(views, args.repeat)
+    print(format_table(results, baseline))
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return
+    missing = missing_baseline(results, baseline, args.baseline)
+    if missing:
+        print(missing, file=sys.stderr)
+        sys.exit(2)
+    regressions = compare(results, baseline)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSION {name} {metric}: {before} -> {after}")
+    sys.exit(1 if regressions or any(r["errors"] for r in results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from benchmarks.corpus import load_page
+from parsers import default_backend, parse_html
+from tables import parse_table
+
+REPEAT = 3
+
+
+def legacy_table(table):
+    # The original scrape_tables body: string cells only, no span handling
+    rows = table.find_all("tr")
+    headers = [th.text.strip() for th in rows[0].find_all("th")]
+    data = [[col.text.strip() for col in row.find_all(["th", "td"])] for row in rows[1:]]
+    return pd.DataFrame(data, columns=headers)
+
+
+def best_of(func, tables):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        frames = [func(table) for table in tables]
+        best = min(best, time.perf_counter() - start)
+    return best, frames
+
+
+def main(size="huge"):
+    document = parse_html(load_page(size), default_backend())
+    tables = document.find_all("table", {"class": "wikitable"})
+    legacy, _ = best_of(legacy_table, tables)
+    engine, frames = best_of(parse_table, tables)
+    cells = sum(df.size for df in frames)
+    print(f"{len(tables)} tables, {cells} cells")
+    print(f"legacy string-only: {legacy * 1000:.1f} ms")
+    print(f"span-aware + typed: {engine * 1000:.1f} ms ({cells / engine:,.0f} cells/s)")
+    print("inferred dtypes:", dict(frames[0].dtypes.astype(str)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "huge")
@@ -0,0 +1,61 @@
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_parsers import OPTIONS, differences
+from benchmarks.corpus import CORPUS_DIR, load_page
+from extractors import extract_page
+from fetcher import looks_js_rendered
+from parsers import PARSER_BACKENDS, available_backends, parse_html
+
+FIXTURE_PATH = CORPUS_DIR / "parser_fixture.html"
+REFERENCE = "html.parser"
+# What fetch_page asks of a parsed document besides extraction: the readiness selectors and the JS-shell check
+SELECTORS = ["table.wikitable", "a[href]", "img, video, audio", "h1", "h6", "p", "li", "span", "iframe"]
+DEFAULT_PAGES = "fixture,small,medium"
+
+
+def load(name):
+    return FIXTURE_PATH.read_text(encoding="utf-8") if name == "fixture" else load_page(name)
+
+
+def check(html, backend):
+    document = parse_html(html, backend)
+    found = [document.select_one(selector) is not None for selector in SELECTORS]
+    return extract_page(document, *OPTIONS), found, looks_js_rendered(html, document)
+
+
+def compare(expected, actual):
+    diffs = differences(expected[0], actual[0])
+    diffs += [f"select_one({selector!r})" for selector, a, b in zip(SELECTORS, expected[1], actual[1]) if a != b]
+    if expected[2] != actual[2]:
+        diffs.append("looks_js_rendered")
+    return diffs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that every installed parser backend extracts what html.parser does.")
+    parser.add_argument("--pages", default=DEFAULT_PAGES, help="comma-separated pages: fixture and/or corpus sizes (small, medium, huge)")
+    args = parser.parse_args(argv)
+
+    installed = available_backends()
+    failed = False
+    for name in [page for page in args.pages.split(",") if page]:
+        html = load(name)
+        reference = check(html, REFERENCE)
+        for backend in PARSER_BACKENDS:
+            if backend == REFERENCE:
+                continue
+            if backend not in installed:
+                print(f"{name:<8}{backend:<13}skipped (not installed)")
+                continue
+            diffs = compare(reference, check(html, backend))
+            failed = failed or bool(diffs)
+            print(f"{name:<8}{backend:<13}{'matches ' + REFERENCE if not diffs else 'differs: ' + ', '.join(diffs)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import gzip
+import random
+import sys
+from pathlib import Path
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+SIZES = {"small": (2, 20, 50), "medium": (8, 200, 400), "huge": (30, 800, 2000)}
+
+
+def _table(rng, rows, index):
+    head = "".join(f"<th>Column {c}</th>" for c in range(6))
+    body = []
+    for r in range(rows):
+        cells = [f"<td>Row {r}</td>", f"<td>{rng.randint(1, 10 ** 7):,}</td>", f"<td>{rng.random() * 100:.2f}<sup>[{rng.randint(1, 9)}]</sup></td>",
+                 f"<td>{rng.randint(1900, 2024)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}</td>", f"<td><a href=\"https://en.wikipedia.org/wiki/Item_{r}\">Item {r}</a></td>",
+                 f"<td>{rng.choice(['Yes', 'No', 'Unknown'])}</td>"]
+        body.append("<tr>" + "".join(cells) + "</tr>")
+    return f"<h3>Table {index}</h3><table class=\"wikitable sortable\"><tr>{head}</tr>{''.join(body)}</table>"
+
+
+def build_page(size="medium", seed=0):
+    # Deterministic stand-in for a saved Wikipedia article: sections, paragraphs, links, images and wikitables
+    tables, rows, paragraphs = SIZES[size]
+    rng = random.Random(seed)
+    parts = ["<html><head><title>Benchmark page</title></head><body><div id=\"content\"><h1>Benchmark page</h1>"]
+    per_section = max(1, paragraphs // max(1, tables))
+    for t in range(tables):
+        parts.append(f"<h2>Section {t}</h2>")
+        for p in range(per_section):
+            words = " ".join(rng.choice(["alpha", "beta", "gamma", "delta", "epsilon", "zeta"]) for _ in range(40))
+            parts.append(f"<p>{words} <a href=\"https://en.wikipedia.org/wiki/Topic_{t}_{p}\">topic</a> <a href=\"#cite_note-{p}\">[{p}]</a></p>")
+        parts.append(f"<img src=\"//upload.wikimedia.org/image_{t}.png\"/>")
+        parts.append("<ul>" + "".join(f"<li><span>Entry {i}</span></li>" for i in range(10)) + "</ul>")
+        parts.append(_table(rng, rows, t))
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def corpus_path(size):
+    return CORPUS_DIR / f"{size}.html.gz"
+
+
+def load_page(size="medium"):
+    # Saved pages are checked in gzip-compressed; regenerate them with `python benchmarks/corpus.py`
+    path = corpus_path(size)
+    if path.exists():
+        return gzip.decompress(path.read_bytes()).decode("utf-8")
+    return build_page(size)
+
+
+def write_corpus():
+    CORPUS_DIR.mkdir(exist_ok=True)
+    for size in SIZES:
+        with open(corpus_path(size), "wb") as f:
+            # mtime=0 keeps the files byte-identical across regenerations
+            f.write(gzip.compress(build_page(size).encode("utf-8"), 9, mtime=0))
+
+
+if __name__ == "__main__":
+    write_corpus()
+    print(f"Wrote {', '.join(SIZES)} pages to {CORPUS_DIR}", file=sys.stderr)
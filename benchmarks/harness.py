@@ -0,0 +1,84 @@
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+REGRESSION_THRESHOLD = 0.20
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(func, repeat=5, warmup=1, units=1, unit="pages"):
+    # Latencies come from untraced runs; peak memory from one extra run under tracemalloc
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    p50 = percentile(timings, 50)
+    return {
+        "p50_ms": p50 * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "throughput": units / p50 if p50 else float("inf"),
+        "unit": f"{unit}/s",
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    path = Path(path)
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    Path(path).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def missing_baseline(results, baseline, path=BASELINE_PATH):
+    # Baselines are machine-specific and not checked in, so a comparison without one has to fail
+    # rather than pass for lack of anything to compare against
+    if not baseline:
+        return f"No baseline at {path}; run once with --save-baseline on this machine first"
+    new = [name for name in results if name not in baseline]
+    if new:
+        return f"No baseline for {', '.join(new)}; rerun with --save-baseline to record them"
+    return None
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    # A stage regresses when its p50 latency or peak memory grows by more than threshold
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "peak_mb"):
+            if previous[metric] > 0 and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append((name, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def format_table(results, baseline):
+    lines = [f"{'stage':<38}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'throughput':>18}{'peak MB':>10}{'vs base':>10}"]
+    for name, r in results.items():
+        previous = baseline.get(name)
+        delta = f"{(r['p50_ms'] / previous['p50_ms'] - 1) * 100:+.0f}%" if previous and previous["p50_ms"] else "-"
+        lines.append(f"{name:<38}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+                     f"{r['throughput']:>12.1f} {r['unit']:<5}{r['peak_mb']:>10.1f}{delta:>10}")
+    return "\n".join(lines)
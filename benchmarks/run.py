@@ -0,0 +1,144 @@
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from benchmarks.corpus import SIZES, load_page
+from benchmarks.harness import BASELINE_PATH, compare, format_table, load_baseline, measure, missing_baseline, save_baseline
+from column_profile import ProfileCache
+from datasets import DatasetCache
+from export import export_to_directory
+from extractors import (extract_page, scrape_headlines_func, scrape_links_func, scrape_media_func, scrape_p_tags_func,
+                        scrape_tables, scrape_tags_func)
+from fetcher import fetch_page, fetch_static
+from page_cache import get_cache
+from parsers import available_backends, default_backend, parse_html
+
+OPTIONS = (True, ["h1", "h2", "h3"], True, True, ["span", "li"], True)
+
+
+def start_corpus_server(pages):
+    # Local stand-in for the origin so fetch numbers do not depend on the network
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = pages.get(self.path.strip("/"))
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_stages(sizes, repeat, only=None):
+    htmls = {size: load_page(size) for size in sizes}
+    server = start_corpus_server({size: html.encode("utf-8") for size, html in htmls.items()})
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    cache = get_cache()
+    cache_enabled = cache.enabled
+    cache.enabled = False
+    workdir = Path(tempfile.mkdtemp(prefix="scrape_bench_"))
+    results = {}
+
+    def bench(name, func, **kwargs):
+        if only and not any(part in name for part in only):
+            return
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = measure(func, repeat=repeat, **kwargs)
+
+    try:
+        for size in sizes:
+            html = htmls[size]
+            mb = len(html.encode("utf-8")) / 1024 / 1024
+            url = f"{base_url}/{size}"
+            bench(f"fetch/http/{size}", lambda: fetch_static(url))
+            bench(f"fetch/page/{size}", lambda: fetch_page(url, ["table.wikitable", "p"]))
+
+            for backend in available_backends():
+                bench(f"parse/{backend}/{size}", lambda: parse_html(html, backend), units=mb, unit="MB")
+
+            soup = parse_html(html, default_backend())
+            extractors = {
+                "scrape_tables": lambda: scrape_tables(soup),
+                "scrape_headlines_func": lambda: scrape_headlines_func(soup, True, ["h1", "h2", "h3"]),
+                "scrape_links_func": lambda: scrape_links_func(soup, True),
+                "scrape_media_func": lambda: scrape_media_func(soup, True),
+                "scrape_tags_func": lambda: scrape_tags_func(soup, ["span", "li"]),
+                "scrape_p_tags_func": lambda: scrape_p_tags_func(soup, True),
+                "extract_page": lambda: extract_page(soup, *OPTIONS),
+            }
+            for name, func in extractors.items():
+                bench(f"extract/{name}/{size}", func)
+
+            results_tuple = extract_page(soup, *OPTIONS)
+            export_dir = workdir / f"export_{size}"
+            bench(f"export/csv/{size}", lambda: export_to_directory([(url, results_tuple)], export_dir, "csv"))
+
+            # The analysis page opens a CSV through the dataset cache and reads every statistic from one
+            # profile scan. Fresh caches per run, so each one loads and profiles instead of hitting
+            tables_csv = workdir / f"tables_{size}.csv"
+            if results_tuple[0]:
+                pd.concat(results_tuple[0], ignore_index=True).to_csv(tables_csv, index=False)
+            else:
+                tables_csv.write_text("a\n1\n", encoding="utf-8")
+            spill_dir = workdir / f"datasets_{size}"
+            bench(f"analysis/load/{size}", lambda: DatasetCache(directory=spill_dir).load(str(tables_csv)))
+            dataset = DatasetCache(directory=spill_dir).load(str(tables_csv))
+            bench(f"analysis/profile/{size}", lambda: ProfileCache().get(dataset))
+            profile = ProfileCache().get(dataset)
+            bench(f"analysis/summary/{size}", lambda: (profile.describe(), profile.null_counts(), profile.overview()))
+    finally:
+        server.shutdown()
+        cache.enabled = cache_enabled
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite over the saved page corpus")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated corpus pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="comma-separated substrings selecting stages, e.g. parse,extract")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    only = [part for part in (args.only or "").split(",") if part]
+    results = run_stages([s for s in args.sizes.split(",") if s], args.repeat, only)
+    baseline = load_baseline(args.baseline)
+    print(format_table(results, baseline))
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    missing = missing_baseline(results, baseline, args.baseline)
+    if missing:
+        print(missing, file=sys.stderr)
+        return 2
+    regressions = compare(results, baseline)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSION {name} {metric}: {before:.1f} -> {after:.1f}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from column_profile import get_profile
+
+MAX_POINTS = 2000
+HISTOGRAM_BINS = 30
+MAX_FLIERS = 1000
+MAX_CHARTS = 64
+TOP_CATEGORIES = 50
+SERIES_CHARTS = ["Line Chart", "Bar Chart", "Area Chart"]
+FIGURE_CHARTS = ["Histogram", "Box Plot"]
+
+
+def lttb(x, y, threshold=MAX_POINTS):
+    # Largest-Triangle-Three-Buckets: keeps the point per bucket that spans the largest triangle
+    # with the previous pick and the next bucket's average, which preserves the visual shape
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        following = slice(end, edges[bucket + 2]) if bucket + 2 < len(edges) else slice(n - 1, n)
+        avg_x, avg_y = x[following].mean(), y[following].mean()
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area)) if end > start else start
+        selected[bucket + 1] = previous
+    return selected
+
+
+def min_max(y, buckets=MAX_POINTS // 2):
+    # Keeps each bucket's lowest and highest point, so spikes survive for bars and filled areas
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    picks = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            window = y[start:end]
+            picks += sorted({start + int(np.argmin(window)), start + int(np.argmax(window))})
+    return np.asarray(picks, dtype=np.int64)
+
+
+def downsample(values, chart_type, max_points=MAX_POINTS):
+    # Returns a frame indexed by the original row number; missing values are dropped first
+    y = values.to_numpy(np.float64, na_value=np.nan)
+    x = np.flatnonzero(~np.isnan(y))
+    y = y[x]
+    picks = lttb(x.astype(np.float64), y, max_points) if chart_type == "Line Chart" else min_max(y, max_points // 2)
+    return pd.DataFrame({values.name: y[picks]}, index=pd.Index(x[picks], name="row"))
+
+
+def histogram(dataset, column, bins=HISTOGRAM_BINS):
+    # Bin edges come from the profile's min/max, so counts accumulate batch by batch
+    stats = get_profile(dataset).columns[column]
+    if stats.min is None:
+        return np.zeros(bins), np.linspace(0, 1, bins + 1)
+    edges = np.histogram_bin_edges([], bins=bins, range=(stats.min, stats.max) if stats.max > stats.min else (stats.min - 0.5, stats.max + 0.5))
+    counts = np.zeros(bins, dtype=np.int64)
+    for batch in dataset.batches([column]):
+        values = batch[column].to_numpy(np.float64, na_value=np.nan)
+        counts += np.histogram(values[~np.isnan(values)], bins=edges)[0]
+    return counts, edges
+
+
+def box_stats(dataset, column, max_fliers=MAX_FLIERS):
+    profile = get_profile(dataset)
+    q1, median, q3 = profile.quantiles(column, (0.25, 0.5, 0.75))
+    low_fence, high_fence = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    whislo, whishi, fliers, flier_count = np.inf, -np.inf, [], 0
+    for batch in dataset.batches([column]):
+        values = batch[column].to_numpy(np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        inside = values[(values >= low_fence) & (values <= high_fence)]
+        if len(inside):
+            whislo, whishi = min(whislo, inside.min()), max(whishi, inside.max())
+        outside = values[(values < low_fence) | (values > high_fence)]
+        flier_count += len(outside)
+        fliers.append(outside[:max_fliers])
+    fliers = np.concatenate(fliers) if fliers else np.empty(0)
+    if len(fliers) > max_fliers:
+        fliers = np.random.default_rng(0).choice(fliers, max_fliers, replace=False)
+    stats = {"label": column, "q1": q1, "med": median, "q3": q3, "fliers": fliers,
+             "whislo": whislo if np.isfinite(whislo) else q1, "whishi": whishi if np.isfinite(whishi) else q3}
+    return stats, flier_count
+
+
+def _png(figure):
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def render_histogram(dataset, column):
+    from matplotlib.figure import Figure
+
+    counts, edges = histogram(dataset, column)
+    figure = Figure(figsize=(8, 4))
+    ax = figure.subplots()
+    ax.stairs(counts, edges, fill=True)
+    ax.set_title(f"Distribution of {column}")
+    return _png(figure)
+
+
+def render_box_plot(dataset, column):
+    from matplotlib.figure import Figure
+
+    stats, flier_count = box_stats(dataset, column)
+    figure = Figure(figsize=(6, 4))
+    ax = figure.subplots()
+    ax.bxp([stats])
+    if flier_count > len(stats["fliers"]):
+        ax.set_title(f"{len(stats['fliers']):,} of {flier_count:,} outliers shown")
+    return _png(figure)
+
+
+def prepare_chart(dataset, column, chart_type, max_points=MAX_POINTS):
+    # ("frame", DataFrame) for Streamlit's native charts, ("png", bytes) for matplotlib figures,
+    # ("message", text) when the column cannot be drawn this way
+    numeric = column in get_profile(dataset).numeric_columns()
+    if chart_type in SERIES_CHARTS:
+        if not numeric:
+            counts = get_profile(dataset).top_values(column, TOP_CATEGORIES)
+            return "frame", pd.DataFrame({column: counts.to_numpy()}, index=counts.index.astype(str))
+        return "frame", downsample(dataset.column(column), chart_type, max_points)
+    if not numeric:
+        return "message", f"{chart_type} needs a numeric column."
+    if chart_type == "Histogram":
+        return "png", render_histogram(dataset, column)
+    return "png", render_box_plot(dataset, column)
+
+
+class ChartCache:
+    def __init__(self, max_charts=MAX_CHARTS):
+        self.max_charts = max_charts
+        self.items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset, column, chart_type):
+        key = (dataset.digest, column, chart_type)
+        with self._lock:
+            chart = self.items.get(key)
+            if chart is not None:
+                self.items.move_to_end(key)
+                return chart
+        chart = prepare_chart(dataset, column, chart_type)
+        with self._lock:
+            self.items[key] = chart
+            while len(self.items) > self.max_charts:
+                self.items.popitem(last=False)
+        return chart
+
+
+_charts = None
+_charts_lock = threading.Lock()
+
+
+def get_chart(dataset, column, chart_type):
+    global _charts
+    with _charts_lock:
+        if _charts is None:
+            _charts = ChartCache()
+    return _charts.get(dataset, column, chart_type)
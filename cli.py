@@ -0,0 +1,178 @@
+import argparse
+import json
+import sys
+
+from api import DEFAULT_HOST, DEFAULT_PORT, JOB_WORKERS, serve
+from batch import FETCH_WORKERS, HOST_INTERVAL, RETRIES, parse_urls
+from core import crawl, entries_to_dict, make_options, results_to_dict, scrape_urls, scrape_wikipedia_data
+from crawler import MAX_DEPTH, MAX_PAGES
+from driver_pool import DEFAULT_PROFILE, RENDER_PROFILES, set_default_profile
+from export import EXPORT_FORMATS, export_to_directory
+from instrumentation import METRICS_FORMATS, export_metrics
+from watch import WATCH_INTERVAL, run_watch
+
+
+def _split(value):
+    return [part.strip() for part in value.split(",") if part.strip()] if value else []
+
+
+def _options(args):
+    return make_options(_split(args.headlines), args.links, args.media, _split(args.tags), args.paragraphs)
+
+
+def _progress(done, total, url):
+    print(f"[{done}/{total}] {url}", file=sys.stderr)
+
+
+def _emit(args, pages, as_json):
+    # Writes files when --output is given, otherwise prints JSON to stdout
+    if args.output:
+        export_to_directory(pages, args.output, args.format)
+        print(f"Wrote {args.format} files to {args.output}", file=sys.stderr)
+    else:
+        json.dump(as_json, sys.stdout, indent=2, default=str, ensure_ascii=False)
+        sys.stdout.write("\n")
+
+
+def cmd_scrape(args):
+    *results, _, error = scrape_wikipedia_data(args.url, *_options(args), args.browser_domain, None, args.parser)
+    if error:
+        print(error, file=sys.stderr)
+        return 1
+    _emit(args, [(args.url, results)], results_to_dict(results))
+    return 0
+
+
+def _emit_entries(args, entries):
+    scraped = [(url, entry["result"]) for url, entry in entries.items() if entry["result"]]
+    _emit(args, scraped, entries_to_dict(entries))
+    failed = [url for url, entry in entries.items() if entry["error"]]
+    for url in failed:
+        print(f"failed: {url}: {entries[url]['error']}", file=sys.stderr)
+    return 1 if failed and not scraped else 0
+
+
+def cmd_batch(args):
+    with open(args.file, encoding="utf-8") as f:
+        urls = parse_urls(f.read())
+    entries = scrape_urls(urls, _options(args), args.browser_domain, parser=args.parser, progress=_progress,
+                          fetch_workers=args.workers, host_interval=args.host_interval, retries=args.retries)
+    return _emit_entries(args, entries)
+
+
+def cmd_crawl(args):
+    scope = {"max_depth": args.max_depth, "max_pages": args.max_pages, "same_domain": not args.any_domain,
+             "include": args.include, "exclude": args.exclude}
+    entries = crawl(args.seed, _options(args), scope, args.browser_domain, parser=args.parser, progress=_progress,
+                    resume=not args.restart, fetch_workers=args.workers, host_interval=args.host_interval, retries=args.retries)
+    return _emit_entries(args, entries)
+
+
+def cmd_watch(args):
+    urls = list(args.urls)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            urls += parse_urls(f.read())
+    if not urls:
+        print("No URLs to watch", file=sys.stderr)
+        return 1
+    sink = open(args.deltas, "a", encoding="utf-8") if args.deltas else sys.stdout
+
+    def emit(delta):
+        # One JSON line per checked page; unchanged pages only report that they were checked
+        sink.write(json.dumps(delta, default=str, ensure_ascii=False) + "\n")
+        sink.flush()
+
+    try:
+        run_watch(urls, _options(args), args.interval, args.rounds, emit, args.browser_domain, parser=args.parser)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+def cmd_serve(args):
+    serve(args.host, args.port, args.workers)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Web Scrapper - Tools, without the Streamlit UI")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_scrape_options(command, exports=True):
+        command.add_argument("--headlines", help="comma-separated headline tags, e.g. h1,h2")
+        command.add_argument("--links", action="store_true", help="scrape links")
+        command.add_argument("--media", action="store_true", help="scrape images, videos and audios")
+        command.add_argument("--tags", help="comma-separated tags, e.g. span,li")
+        command.add_argument("--paragraphs", action="store_true", help="scrape paragraphs")
+        command.add_argument("--parser", help="html.parser, lxml or selectolax")
+        command.add_argument("--browser-domain", action="append", default=[], help="always render this domain in the browser")
+        if exports:
+            command.add_argument("--output", help="write per-category files to this folder instead of printing JSON")
+            command.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        command.add_argument("--render-profile", choices=list(RENDER_PROFILES), default=DEFAULT_PROFILE,
+                             help="which resources the browser fallback downloads")
+        command.add_argument("--metrics", help="write per-stage timings to this file when done")
+        command.add_argument("--metrics-format", choices=METRICS_FORMATS, default="openmetrics",
+                             help="openmetrics overwrites the file, jsonl appends one trace per line")
+
+    def add_batch_options(command):
+        command.add_argument("--workers", type=int, default=FETCH_WORKERS, help="concurrent fetches")
+        command.add_argument("--host-interval", type=float, default=HOST_INTERVAL, help="min seconds between requests to one host")
+        command.add_argument("--retries", type=int, default=RETRIES)
+
+    scrape = commands.add_parser("scrape", help="scrape a single URL")
+    scrape.add_argument("url")
+    add_scrape_options(scrape)
+    scrape.set_defaults(func=cmd_scrape)
+
+    batch_command = commands.add_parser("batch", help="scrape every URL listed in a file")
+    batch_command.add_argument("file")
+    add_scrape_options(batch_command)
+    add_batch_options(batch_command)
+    batch_command.set_defaults(func=cmd_batch)
+
+    crawl_command = commands.add_parser("crawl", help="crawl from a seed URL")
+    crawl_command.add_argument("seed")
+    crawl_command.add_argument("--max-depth", type=int, default=MAX_DEPTH)
+    crawl_command.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    crawl_command.add_argument("--any-domain", action="store_true", help="follow links to other domains")
+    crawl_command.add_argument("--include", help="only follow URLs matching this regex")
+    crawl_command.add_argument("--exclude", help="never follow URLs matching this regex")
+    crawl_command.add_argument("--restart", action="store_true", help="ignore any existing checkpoint")
+    add_scrape_options(crawl_command)
+    add_batch_options(crawl_command)
+    crawl_command.set_defaults(func=cmd_crawl)
+
+    watch_command = commands.add_parser("watch", help="re-check pages on a schedule and print what changed")
+    watch_command.add_argument("urls", nargs="*")
+    watch_command.add_argument("--file", help="also watch every URL listed in this file")
+    watch_command.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="seconds between checks of the URL list")
+    watch_command.add_argument("--rounds", type=int, help="stop after this many checks (default: run until interrupted)")
+    watch_command.add_argument("--deltas", help="append JSON-lines deltas to this file instead of stdout")
+    add_scrape_options(watch_command, exports=False)
+    watch_command.set_defaults(func=cmd_watch)
+
+    serve_command = commands.add_parser("serve", help="run the HTTP API with a job queue")
+    serve_command.add_argument("--host", default=DEFAULT_HOST)
+    serve_command.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_command.add_argument("--workers", type=int, default=JOB_WORKERS, help="jobs processed in parallel")
+    serve_command.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "render_profile", None):
+        set_default_profile(RENDER_PROFILES[args.render_profile])
+    status = args.func(args)
+    if getattr(args, "metrics", None):
+        export_metrics(args.metrics, args.metrics_format)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MAX_INDEXES = 32
+VALUES_PAGE_SIZE = 50
+OPERATORS = ["equals", "one of", "between", "is missing"]
+
+
+class ColumnIndex:
+    # Factorized codes over the sorted distinct values, plus row positions grouped by code. Every
+    # row holding one value, or any value in a range, is then a single contiguous slice of `order`.
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, sort=True, use_na_sentinel=True)
+        self.uniques = pd.Index(uniques)
+        self.order = np.argsort(codes, kind="stable")
+        # starts[c + 1] is where code c begins in order; slot 0 holds the missing values (code -1)
+        self.starts = np.searchsorted(codes[self.order], np.arange(-1, len(uniques) + 1))
+        self.counts = np.diff(self.starts)[1:]
+        self.numeric = pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+        self._labels = None
+
+    def __len__(self):
+        return len(self.uniques)
+
+    def _slice(self, first_code, last_code):
+        # Positions for codes first_code..last_code-1 (code -1 means missing)
+        return self.order[self.starts[first_code + 1]:self.starts[last_code + 1]]
+
+    def equals(self, value):
+        code = self.uniques.get_indexer([value])[0]
+        return self._slice(code, code + 1) if code >= 0 else np.empty(0, dtype=np.int64)
+
+    def one_of(self, values):
+        parts = [self.equals(value) for value in dict.fromkeys(values)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def between(self, lower, upper):
+        first = self.uniques.searchsorted(lower, side="left")
+        last = self.uniques.searchsorted(upper, side="right")
+        return self._slice(first, last) if last > first else np.empty(0, dtype=np.int64)
+
+    def missing(self):
+        return self._slice(-1, 0)
+
+    def bounds(self):
+        return (self.uniques[0], self.uniques[-1]) if len(self.uniques) else (None, None)
+
+    def values(self, search="", page=0, page_size=VALUES_PAGE_SIZE):
+        # Distinct values by frequency, filtered by a substring and cut into pages; returns (page, matches)
+        if self._labels is None:
+            self._labels = self.uniques.astype(str).str.lower()
+        codes = np.arange(len(self.uniques))
+        if search:
+            codes = codes[np.asarray(self._labels.str.contains(search.lower(), regex=False), dtype=bool)]
+        codes = codes[np.argsort(-self.counts[codes], kind="stable")]
+        shown = codes[page * page_size:(page + 1) * page_size]
+        return pd.DataFrame({"value": self.uniques[shown], "count": self.counts[shown]}), len(codes)
+
+    def select(self, operator, value):
+        if operator == "equals":
+            return self.equals(value)
+        if operator == "one of":
+            return self.one_of(value)
+        if operator == "between":
+            return self.between(*value)
+        if operator == "is missing":
+            return self.missing()
+        raise ValueError(f"Unknown filter operator: {operator}")
+
+
+class IndexCache:
+    def __init__(self, max_indexes=MAX_INDEXES):
+        self.max_indexes = max_indexes
+        self.items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset, column):
+        key = (dataset.digest, column)
+        with self._lock:
+            index = self.items.get(key)
+            if index is not None:
+                self.items.move_to_end(key)
+                return index
+        # Built on first use of a column, from that column alone
+        index = ColumnIndex(dataset.column(column))
+        with self._lock:
+            self.items[key] = index
+            while len(self.items) > self.max_indexes:
+                self.items.popitem(last=False)
+        return index
+
+
+_indexes = None
+_indexes_lock = threading.Lock()
+
+
+def get_index(dataset, column):
+    global _indexes
+    with _indexes_lock:
+        if _indexes is None:
+            _indexes = IndexCache()
+    return _indexes.get(dataset, column)
+
+
+def query(dataset, predicates):
+    # predicates: [(column, operator, value)], combined with AND; returns sorted row positions
+    positions = None
+    matches = sorted((get_index(dataset, column).select(operator, value) for column, operator, value in predicates), key=len)
+    for selected in matches:
+        selected = np.sort(selected)
+        positions = selected if positions is None else np.intersect1d(positions, selected, assume_unique=True)
+        if not len(positions):
+            break
+    return np.arange(dataset.shape[0]) if positions is None else positions
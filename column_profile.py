@@ -0,0 +1,291 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+QUANTILE_K = 2048
+HLL_PRECISION = 14
+EXACT_DISTINCT = 4096
+TOP_K = 1000
+MAX_PROFILES = 8
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class QuantileSketch:
+    # KLL-style compactors: each level holds at most k items of weight 2**level; an overfull level
+    # is sorted and every other item (random offset) moves up a level. Mergeable, rank error ~ 1/k.
+    def __init__(self, k=QUANTILE_K, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.k:
+                items = np.sort(items)
+                keep = items[len(items) - len(items) % 2:]
+                promoted = items[self._rng.integers(2):len(items) - len(items) % 2:2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantiles(self, qs):
+        # Linear interpolation between neighbouring ranks, as pandas and np.quantile do
+        items = np.concatenate(self.levels)
+        if not len(items):
+            return [np.nan for _ in qs]
+        if len(self.levels) == 1:
+            # Nothing has been compacted yet, so the answer is exact
+            return np.quantile(items, qs).tolist()
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        weights = weights[order]
+        # An item of weight w stands for w consecutive ranks; it sits at the middle one
+        ranks = np.cumsum(weights) - (weights + 1) / 2
+        return np.interp(np.asarray(qs) * (weights.sum() - 1), ranks, items[order]).tolist()
+
+
+def _leading_zeros(values):
+    zeros = np.zeros(len(values), dtype=np.int64)
+    x = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = (x >> np.uint64(64 - shift)) == 0
+        zeros += shift * empty
+        x = np.where(empty, x << np.uint64(shift), x)
+    return zeros + (x == 0)
+
+
+class DistinctCounter:
+    # Exact while the column has few distinct values, HyperLogLog after that
+    def __init__(self, precision=HLL_PRECISION, exact_limit=EXACT_DISTINCT):
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self.exact = set()
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        if self.exact is not None:
+            self.exact.update(np.unique(hashes).tolist())
+            if len(self.exact) > self.exact_limit:
+                self.exact = None
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes << np.uint64(p)
+        rank = np.minimum(_leading_zeros(rest) + 1, 64 - p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self):
+        if self.exact is not None:
+            return len(self.exact)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            return int(round(m * np.log(m / empty)))
+        return int(round(raw))
+
+
+class TopK:
+    # Misra-Gries summary: counts are exact while there are at most `capacity` distinct values,
+    # otherwise each is undercounted by at most rows / capacity
+    def __init__(self, capacity=TOP_K):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+
+    def update(self, counts):
+        counts = counts[counts > 0]
+        if isinstance(counts.index, pd.CategoricalIndex):
+            counts.index = counts.index.astype(object)
+        merged = self.counts.add(counts, fill_value=0)
+        if len(merged) > self.capacity:
+            merged = merged.sort_values(ascending=False)
+            merged = merged - merged.iloc[self.capacity]
+            merged = merged[merged > 0]
+        self.counts = merged.astype("int64")
+
+    def top(self, limit=None):
+        ordered = self.counts.sort_values(ascending=False, kind="stable")
+        return ordered if limit is None else ordered.head(limit)
+
+
+def _is_numeric(dtype):
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+class ColumnProfile:
+    def __init__(self, name, dtype):
+        self.name = name
+        self.dtype = dtype
+        self.numeric = _is_numeric(dtype)
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = QuantileSketch() if self.numeric else None
+        self.distinct = DistinctCounter()
+        self.top_k = TopK()
+
+    def update(self, series):
+        present = series.dropna()
+        self.nulls += len(series) - len(present)
+        if not len(present):
+            return
+        if self.numeric:
+            values = present.to_numpy(np.float64)
+            # Chan et al. parallel update of count, mean and sum of squared deviations
+            n, mean, m2 = len(values), values.mean(), ((values - values.mean()) ** 2).sum()
+            delta = mean - self.mean
+            total = self.count + n
+            self.mean += delta * n / total
+            self.m2 += m2 + delta * delta * self.count * n / total
+            self.min = values.min() if self.min is None else min(self.min, values.min())
+            self.max = values.max() if self.max is None else max(self.max, values.max())
+            self.sketch.update(values)
+        self.count += len(present)
+        self.distinct.update(pd.util.hash_pandas_object(present, index=False).to_numpy(np.uint64))
+        self.top_k.update(present.value_counts())
+
+    @property
+    def var(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    def quantiles(self, qs=QUANTILES):
+        return self.sketch.quantiles(qs) if self.numeric else [np.nan for _ in qs]
+
+
+class CorrelationAccumulator:
+    # Pairwise-complete Pearson correlation from per-batch matrix products, like DataFrame.corr()
+    def __init__(self, columns):
+        self.columns = columns
+        self.shift = None
+        size = len(columns)
+        self.n = np.zeros((size, size))
+        self.sx = np.zeros((size, size))
+        self.sxx = np.zeros((size, size))
+        self.sxy = np.zeros((size, size))
+
+    def update(self, frame):
+        values = frame[self.columns].to_numpy(np.float64, na_value=np.nan)
+        if self.shift is None:
+            # Centering on the first batch's means keeps the sums well conditioned
+            self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(self.columns))
+        present = ~np.isnan(values)
+        x = np.where(present, values - self.shift, 0.0)
+        mask = present.astype(np.float64)
+        self.n += mask.T @ mask
+        self.sx += x.T @ mask
+        self.sxx += (x * x).T @ mask
+        self.sxy += x.T @ x
+
+    def matrix(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = self.n * self.sxy - self.sx * self.sx.T
+            var = (self.n * self.sxx - self.sx ** 2) * (self.n * self.sxx - self.sx ** 2).T
+            corr = cov / np.sqrt(var)
+        corr[self.n < 2] = np.nan
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+
+class DatasetProfile:
+    def __init__(self, columns, rows, correlation):
+        self.columns = columns
+        self.rows = rows
+        self.correlation = correlation
+
+    def numeric_columns(self):
+        return [name for name, column in self.columns.items() if column.numeric]
+
+    def null_counts(self):
+        return pd.Series({name: column.nulls for name, column in self.columns.items()})
+
+    def describe(self):
+        # Same layout as DataFrame.describe(); quartiles come from the sketch
+        stats = {}
+        for name in self.numeric_columns():
+            column = self.columns[name]
+            q1, median, q3 = column.quantiles()
+            stats[name] = {"count": column.count, "mean": column.mean if column.count else np.nan, "std": np.sqrt(column.var),
+                           "min": column.min, "25%": q1, "50%": median, "75%": q3, "max": column.max}
+        return pd.DataFrame(stats, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"])
+
+    def overview(self):
+        return pd.DataFrame({
+            name: {"non-null": column.count, "nulls": column.nulls, "distinct (approx.)": column.distinct.estimate(),
+                   "most common": column.top_k.top(1).index[0] if len(column.top_k.counts) else None}
+            for name, column in self.columns.items()
+        }).T
+
+    def quantiles(self, name, qs=QUANTILES):
+        return self.columns[name].quantiles(qs)
+
+    def top_values(self, name, limit=None):
+        return self.columns[name].top_k.top(limit)
+
+    def corr(self):
+        return self.correlation.matrix()
+
+
+def profile_dataset(dataset):
+    # One scan over the dataset's batches feeds every column's sketches and the correlation sums
+    dtypes = dataset.dtypes
+    columns = {name: ColumnProfile(name, dtype) for name, dtype in dtypes.items()}
+    correlation = CorrelationAccumulator([name for name, column in columns.items() if column.numeric])
+    rows = 0
+    for batch in dataset.batches():
+        rows += len(batch)
+        for name, column in columns.items():
+            column.update(batch[name])
+        if correlation.columns:
+            correlation.update(batch)
+    return DatasetProfile(columns, rows, correlation)
+
+
+class ProfileCache:
+    def __init__(self, max_profiles=MAX_PROFILES):
+        self.max_profiles = max_profiles
+        self.items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset):
+        with self._lock:
+            profile = self.items.get(dataset.digest)
+            if profile is not None:
+                self.items.move_to_end(dataset.digest)
+                return profile
+        profile = profile_dataset(dataset)
+        with self._lock:
+            self.items[dataset.digest] = profile
+            while len(self.items) > self.max_profiles:
+                self.items.popitem(last=False)
+        return profile
+
+
+_profiles = None
+_profiles_lock = threading.Lock()
+
+
+def get_profile(dataset):
+    global _profiles
+    with _profiles_lock:
+        if _profiles is None:
+            _profiles = ProfileCache()
+    return _profiles.get(dataset)
@@ -0,0 +1,79 @@
+import json
+
+from batch import run_batch
+from crawler import run_crawl
+from fetcher import fetch_page, required_selectors
+from instrumentation import span, trace
+from result_cache import get_extraction_cache
+
+# UI-free scraping entry points shared by the Streamlit app, the CLI and the HTTP API.
+# Nothing imported from here may pull in streamlit, matplotlib or seaborn.
+
+
+def make_options(headlines=(), links=False, media=False, tags=(), paragraphs=False):
+    # Builds the positional option tuple the scrape_* functions take from keyword settings
+    return (bool(headlines), list(headlines), bool(links), bool(media), list(tags), bool(paragraphs))
+
+
+def options_from_dict(settings):
+    return make_options(
+        settings.get("headlines", ()),
+        settings.get("links", False),
+        settings.get("media", False),
+        settings.get("tags", ()),
+        settings.get("paragraphs", False),
+    )
+
+
+def scrape_wikipedia_data(url, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains=(), readiness=None, parser=None, use_cache=True, render_profile=None, cache_ttl=None):
+    # The spans below are collected into instrumentation.last_trace() for the per-stage breakdown.
+    # Returns the six result lists, this call's fetch record and an error message (or None)
+    with trace("scrape", url=url) as current:
+        record = None
+        try:
+            selectors = required_selectors(scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+            with span("fetch"):
+                page_source, soup, record = fetch_page(url, selectors, browser_domains, readiness, parser, use_cache, render_profile, cache_ttl)
+            current["method"], current["cache"] = record["method"], record["cache"]
+            cache = get_extraction_cache()
+            digest = cache.add_page(url, page_source, soup, parser)
+            options = (scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+            return *cache.extract(digest, options, parser), record, None
+        except Exception as e:
+            current["error"] = str(e)
+            return None, None, None, None, None, None, record, f"Error occurred: {str(e)}"
+
+
+def scrape_urls(urls, options, browser_domains=(), readiness=None, parser=None, progress=None, **batch_settings):
+    selectors = required_selectors(*options)
+    return run_batch(urls, options, selectors, browser_domains, readiness, progress=progress, parser=parser, **batch_settings)
+
+
+def crawl(seed, options, scope=None, browser_domains=(), readiness=None, parser=None, progress=None, resume=True, **batch_settings):
+    selectors = required_selectors(*options)
+    return run_crawl(seed, options, scope, selectors, browser_domains, readiness, progress=progress, parser=parser, resume=resume, **batch_settings)
+
+
+def results_to_dict(results):
+    tables, headlines, links, media, tags_data, p_tags_data = results
+    return {
+        # Round-trip through pandas' JSON writer so dates and nullable ints serialize cleanly
+        "tables": [json.loads(df.to_json(orient="split", index=False, date_format="iso")) for df in tables],
+        "headlines": headlines,
+        "links": links,
+        "media": media,
+        "tags": tags_data,
+        "paragraphs": p_tags_data,
+    }
+
+
+def entries_to_dict(entries):
+    # Batch and crawl results: {url: {"result", "error", "fetch"}} with the result tuple made JSON-friendly
+    return {
+        url: {
+            "error": entry["error"],
+            "fetch": entry["fetch"],
+            "result": results_to_dict(entry["result"]) if entry["result"] else None,
+        }
+        for url, entry in entries.items()
+    }
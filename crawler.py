@@ -0,0 +1,217 @@
+import base64
+import hashlib
+import heapq
+import json
+import os
+import pickle
+import re
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from batch import BACKOFF, FETCH_WORKERS, HOST_INTERVAL, RETRIES, HostRateLimiter, check_page_html, fetch_with_retries, get_parse_pool
+from extractors import extract_page
+from fetcher import host_of
+
+MAX_DEPTH = 2
+MAX_PAGES = 100
+CHECKPOINT_DIR = Path(__file__).resolve().parent / ".crawl"
+SKIPPED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".pdf", ".zip", ".mp3", ".mp4", ".ogg", ".webm")
+
+
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+def url_key(url):
+    # 64-bit digest of the normalized URL; a set of ints is far smaller than a set of URL strings
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def compile_patterns(scope):
+    # Checked before anything is fetched, so a typo in a pattern fails the crawl up front
+    patterns = {}
+    for name in ("include", "exclude"):
+        try:
+            patterns[name] = re.compile(scope[name]) if scope.get(name) else None
+        except re.error as e:
+            raise ValueError(f"Invalid {name} pattern {scope[name]!r}: {e}") from e
+    return patterns
+
+
+def in_scope(url, seed_host, scope, patterns):
+    if not url.startswith(("http://", "https://")) or urlsplit(url).path.lower().endswith(SKIPPED_EXTENSIONS):
+        return False
+    if scope.get("same_domain", True) and host_of(url) != seed_host:
+        return False
+    if patterns["include"] and not patterns["include"].search(url):
+        return False
+    if patterns["exclude"] and patterns["exclude"].search(url):
+        return False
+    return True
+
+
+def crawl_extract(html, url, record, options, selectors=(), parser=None):
+    # Runs in the parse pool: the selected extractors plus every outgoing link for the frontier,
+    # or only the reason when the page has to go through the browser first
+    document, reason = check_page_html(html, record, selectors, parser)
+    if reason:
+        return None, [], reason
+    results = extract_page(document, *options)
+    links = []
+    for anchor in document.find_all("a", href=True):
+        href = anchor["href"]
+        if href and not href.startswith(("#", "javascript:", "mailto:")):
+            links.append(normalize_url(urljoin(url, href)))
+    return results, links, ""
+
+
+class CrawlState:
+    def __init__(self, seed, directory):
+        self.seed = normalize_url(seed)
+        self.directory = Path(directory)
+        self.frontier = []
+        self.seen = set()
+        self.visited = []
+        self.in_flight = {}
+        self.results = {}
+        self.sequence = 0
+        self.push(self.seed, 0)
+
+    def push(self, url, depth):
+        key = url_key(url)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.sequence += 1
+        # Shallow pages first, then discovery order
+        heapq.heappush(self.frontier, (depth, self.sequence, url))
+        return True
+
+    def record(self, url, depth, entry):
+        # Checkpointed with every page: its links are already on the frontier, and a resumed
+        # crawl must not fetch a page whose result is on disk again
+        self.visited.append([url, depth])
+        self.results[url] = entry
+        pages = self.directory / "pages"
+        pages.mkdir(parents=True, exist_ok=True)
+        with open(pages / f"{url_key(url):016x}.pkl", "wb") as f:
+            pickle.dump(entry, f)
+        self.save()
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Pages still being fetched go back on the frontier so a resumed crawl picks them up
+        frontier = self.frontier + [(depth, 0, url) for url, depth in self.in_flight.items()]
+        state = {
+            "seed": self.seed,
+            "frontier": frontier,
+            "sequence": self.sequence,
+            "visited": self.visited,
+            "seen": base64.b64encode(array("Q", self.seen).tobytes()).decode("ascii"),
+        }
+        tmp = self.directory / "state.json.tmp"
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.directory / "state.json")
+
+    @classmethod
+    def load(cls, seed, directory):
+        path = Path(directory) / "state.json"
+        if not path.exists():
+            return cls(seed, directory)
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state["seed"] != normalize_url(seed):
+            raise ValueError(f"Checkpoint in {directory} belongs to a crawl of {state['seed']}")
+        crawl = cls.__new__(cls)
+        crawl.seed = state["seed"]
+        crawl.directory = Path(directory)
+        crawl.frontier = [tuple(item) for item in state["frontier"]]
+        heapq.heapify(crawl.frontier)
+        crawl.sequence = state["sequence"]
+        crawl.visited = state["visited"]
+        crawl.in_flight = {}
+        seen = array("Q")
+        seen.frombytes(base64.b64decode(state["seen"]))
+        crawl.seen = set(seen)
+        crawl.results = {}
+        for url, _ in crawl.visited:
+            try:
+                with open(crawl.directory / "pages" / f"{url_key(url):016x}.pkl", "rb") as f:
+                    crawl.results[url] = pickle.load(f)
+            except OSError:
+                pass
+        return crawl
+
+
+def checkpoint_dir_for(seed):
+    return CHECKPOINT_DIR / f"{url_key(normalize_url(seed)):016x}"
+
+
+def run_crawl(seed, options, scope=None, selectors=(), browser_domains=(), readiness=None, fetch_workers=FETCH_WORKERS,
+              host_interval=HOST_INTERVAL, retries=RETRIES, progress=None, parser=None, directory=None, resume=True,
+              use_cache=True, render_profile=None, cache_ttl=None):
+    scope = scope or {}
+    patterns = compile_patterns(scope)
+    max_depth = scope.get("max_depth", MAX_DEPTH)
+    max_pages = scope.get("max_pages", MAX_PAGES)
+    directory = directory or checkpoint_dir_for(seed)
+    state = CrawlState.load(seed, directory) if resume else CrawlState(seed, directory)
+    seed_host = host_of(state.seed)
+    limiter = HostRateLimiter(host_interval)
+    parse_pool = get_parse_pool()
+    fetch_records = {}
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool:
+        pending = {}
+        while True:
+            fetching = sum(1 for _, stage, _ in pending.values() if stage == "fetch")
+            while state.frontier and fetching < fetch_workers and len(state.visited) + len(state.in_flight) < max_pages:
+                depth, _, url = heapq.heappop(state.frontier)
+                state.in_flight[url] = depth
+                future = fetch_pool.submit(fetch_with_retries, url, selectors, browser_domains, readiness, limiter, retries, BACKOFF, parser,
+                                           use_cache, render_profile, cache_ttl)
+                pending[future] = (url, "fetch", depth)
+                fetching += 1
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                url, stage, depth = pending.pop(future)
+                entry = {"result": None, "error": None, "fetch": None, "depth": depth}
+                try:
+                    value = future.result()
+                except Exception as e:
+                    entry["error"] = f"Error occurred during {stage}: {str(e)}"
+                else:
+                    if stage == "fetch":
+                        html, record = value
+                        future = parse_pool.submit(crawl_extract, html, url, record, options, selectors, parser)
+                        pending[future] = (url, "parse", depth)
+                        fetch_records[url] = record
+                        continue
+                    entry["result"], links, reason = value
+                    if reason:
+                        future = fetch_pool.submit(fetch_with_retries, url, selectors, browser_domains, readiness, limiter, retries, BACKOFF,
+                                                   parser, use_cache, render_profile, cache_ttl, reason)
+                        pending[future] = (url, "fetch", depth)
+                        continue
+                    if depth < max_depth:
+                        for link in links:
+                            if in_scope(link, seed_host, scope, patterns):
+                                state.push(link, depth + 1)
+                entry["fetch"] = fetch_records.pop(url, None)
+                state.in_flight.pop(url, None)
+                state.record(url, depth, entry)
+                if progress:
+                    progress(len(state.visited), max_pages, url)
+
+    state.save()
+    return state.results
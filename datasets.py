@@ -0,0 +1,401 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SPILL_DIR = Path(__file__).resolve().parent / ".datasets"
+# The only place server-side CSVs can be opened from by name
+DATA_DIR = Path(__file__).resolve().parent / "data"
+# CSVs larger than this share of physical memory are converted to Parquet and read from disk
+SPILL_FRACTION = 0.1
+DEFAULT_MEMORY = 4 * 1024 * 1024 * 1024
+CATEGORY_RATIO = 0.5
+CHUNK_BYTES = 16 * 1024 * 1024
+BATCH_ROWS = 250_000
+SAMPLE_ROWS = 50_000
+MAX_DATASETS = 4
+MAX_BYTES = 2 * 1024 * 1024 * 1024
+MAX_SPILL_BYTES = 20 * 1024 * 1024 * 1024
+MAX_FILTER_ROWS = 10_000
+
+
+def memory_budget():
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return DEFAULT_MEMORY
+
+
+def data_path(name, directory=DATA_DIR):
+    # Resolved before the check, so "..", absolute paths and symlinks cannot leave the data directory
+    root = Path(directory).resolve()
+    path = (root / name).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"{name} is outside the data directory")
+    if not path.is_file():
+        raise ValueError(f"No file named {name} in the data directory")
+    return path
+
+
+def _is_path(source):
+    return isinstance(source, (str, Path))
+
+
+def _rewind(source):
+    if _is_path(source):
+        return str(source)
+    source.seek(0)
+    return source
+
+
+def source_size(source):
+    if _is_path(source):
+        return os.path.getsize(source)
+    position = source.tell()
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+
+def file_digest(source):
+    digest = hashlib.blake2b(digest_size=16)
+    if _is_path(source):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+                digest.update(chunk)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(CHUNK_BYTES), b""):
+            digest.update(chunk)
+        source.seek(0)
+    return digest.hexdigest()
+
+
+def frame_digest(frame):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(name), str(dtype)) for name, dtype in frame.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def write_arrow(frame, path):
+    import pyarrow as pa
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    partial = path.with_suffix(".partial")
+    with pa.OSFile(str(partial), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(partial, path)
+    return path
+
+
+def read_arrow(path):
+    # The Arrow buffers are memory-mapped from the file, but to_pandas still copies every column
+    # that needs a type conversion (strings, dates, nullable ints)
+    import pyarrow as pa
+
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+
+
+def optimize_frame(df):
+    # Smallest lossless numeric dtypes, and categories for repetitive text columns
+    for column in df.columns:
+        series = df[column]
+        kind = series.dtype.kind
+        if kind in "iu":
+            df[column] = pd.to_numeric(series, downcast="unsigned" if kind == "u" or series.min() >= 0 else "integer")
+        elif kind == "f":
+            narrow = series.astype(np.float32)
+            if np.array_equal(narrow.to_numpy(np.float64), series.to_numpy(), equal_nan=True):
+                df[column] = narrow
+        elif kind == "O" and len(series) and series.nunique(dropna=True) <= CATEGORY_RATIO * len(series):
+            df[column] = series.astype("category")
+    return df
+
+
+def read_csv(source):
+    try:
+        return pd.read_csv(_rewind(source), engine="pyarrow")
+    except ImportError:
+        return pd.read_csv(_rewind(source))
+
+
+def _write_parquet(source, path, column_types=None):
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    reader = pa_csv.open_csv(
+        _rewind(source),
+        read_options=pa_csv.ReadOptions(block_size=CHUNK_BYTES),
+        # Empty text fields become nulls, as they do in pd.read_csv, so both kinds of dataset agree on missing values
+        convert_options=pa_csv.ConvertOptions(column_types=column_types or {}, strings_can_be_null=True),
+    )
+    with pq.ParquetWriter(path, reader.schema) as writer:
+        for batch in reader:
+            writer.write_table(pa.Table.from_batches([batch]))
+
+
+def spill_csv(source, path):
+    # Streams the CSV block by block into Parquet, so the file never has to fit in memory
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    try:
+        _write_parquet(source, partial)
+    except pa.ArrowInvalid:
+        # Column types are inferred from the first block; when a later block disagrees, keep text
+        names = pa_csv.open_csv(_rewind(source)).schema.names
+        _write_parquet(source, partial, {name: pa.string() for name in names})
+    os.replace(partial, path)
+    return path
+
+
+class Dataset:
+    # Either an in-memory DataFrame or a memory-mapped Parquet spill file; the methods below
+    # work on both, reading the spill batch by batch or one column at a time
+    def __init__(self, digest, name, frame=None, path=None):
+        self.digest = digest
+        self.name = name
+        self.frame = frame
+        self.path = Path(path) if path else None
+        self._schema = None
+
+    @property
+    def in_memory(self):
+        return self.frame is not None
+
+    @property
+    def schema(self):
+        if self._schema is None:
+            import pyarrow.parquet as pq
+            self._schema = pq.read_schema(self.path)
+        return self._schema
+
+    def _string_columns(self):
+        import pyarrow as pa
+        return [field.name for field in self.schema if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)]
+
+    def _parquet(self):
+        import pyarrow.parquet as pq
+        # Dictionary-encoded reads turn text columns into pandas categoricals
+        return pq.ParquetFile(self.path, memory_map=True, read_dictionary=self._string_columns())
+
+    def _dataset(self):
+        import pyarrow.dataset as ds
+        return ds.dataset(self.path, format="parquet")
+
+    @property
+    def shape(self):
+        if self.in_memory:
+            return self.frame.shape
+        metadata = self._parquet().metadata
+        return metadata.num_rows, metadata.num_columns
+
+    @property
+    def columns(self):
+        return self.frame.columns.tolist() if self.in_memory else list(self.schema.names)
+
+    @property
+    def dtypes(self):
+        if self.in_memory:
+            return self.frame.dtypes
+        return self.schema.empty_table().to_pandas().dtypes
+
+    def nbytes(self):
+        return int(self.frame.memory_usage(deep=True).sum()) if self.in_memory else 0
+
+    def head(self, n=5):
+        if self.in_memory:
+            return self.frame.head(n)
+        batch = next(self._parquet().iter_batches(batch_size=n), None)
+        return batch.to_pandas() if batch is not None else pd.DataFrame(columns=self.columns)
+
+    def tail(self, n=5):
+        if self.in_memory:
+            return self.frame.tail(n)
+        rows = self.shape[0]
+        return self.take(np.arange(max(0, rows - n), rows))
+
+    def batches(self, columns=None):
+        if self.in_memory:
+            yield self.frame if columns is None else self.frame[columns]
+            return
+        for batch in self._parquet().iter_batches(batch_size=BATCH_ROWS, columns=columns):
+            yield batch.to_pandas()
+
+    def column(self, name):
+        if self.in_memory:
+            return self.frame[name]
+        return self._parquet().read(columns=[name]).column(0).to_pandas()
+
+    def take(self, positions, limit=MAX_FILTER_ROWS):
+        positions = np.asarray(positions)[:limit]
+        if self.in_memory:
+            return self.frame.iloc[positions]
+        # Only the row groups holding these rows are read from the spill file. The spill has no
+        # index of its own, so the row positions stand in for it, as they do for a default RangeIndex
+        return self._dataset().take(positions).to_pandas().set_axis(positions)
+
+    def filter_outside(self, name, lower, upper, limit=MAX_FILTER_ROWS):
+        if self.in_memory:
+            column = self.frame[name]
+            matches = self.frame[(column < lower) | (column > upper)]
+            return matches.head(limit), len(matches)
+        import pyarrow.dataset as ds
+        expression = (ds.field(name) < float(lower)) | (ds.field(name) > float(upper))
+        dataset = self._dataset()
+        return dataset.head(limit, filter=expression).to_pandas(), dataset.count_rows(filter=expression)
+
+    def group_aggregate(self, name, function):
+        if self.in_memory:
+            return self.frame.groupby(name, observed=True).agg({name: function})
+        import pyarrow.parquet as pq
+        table = pq.read_table(self.path, columns=[name], memory_map=True)
+        grouped = table.group_by(name).aggregate([(name, function)]).to_pandas().set_index(name)
+        # Same shape as the groupby above: the result column keeps the column's name (Arrow calls
+        # it "<name>_<function>"), missing keys are not a group, and groups come out sorted
+        grouped = grouped.rename(columns={f"{name}_{function}": name})
+        return grouped[grouped.index.notna()].sort_index()
+
+    def sample(self, rows=SAMPLE_ROWS, columns=None):
+        # Plots draw from a uniform sample rather than the full dataset once it gets large
+        n_rows = self.shape[0]
+        if self.in_memory:
+            frame = self.frame if columns is None else self.frame[columns]
+            return frame if n_rows <= rows else frame.sample(rows, random_state=0)
+        fraction = min(1.0, rows / max(n_rows, 1))
+        parts = [batch.sample(frac=fraction, random_state=index) for index, batch in enumerate(self.batches(columns))]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns or self.columns)
+
+
+class DatasetCache:
+    # Loaded datasets keyed by content hash, so Streamlit reruns reuse the parsed frame
+    def __init__(self, max_datasets=MAX_DATASETS, max_bytes=MAX_BYTES, directory=SPILL_DIR):
+        self.max_datasets = max_datasets
+        self.max_bytes = max_bytes
+        self.directory = Path(directory)
+        self.items = OrderedDict()
+        self._digests = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "spilled": 0, "evicted": 0}
+
+    def digest(self, source):
+        # Hashing a multi-GB file on every rerun would defeat the cache, so remember it per file version
+        if _is_path(source):
+            stat = os.stat(source)
+            key = ("path", os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+        else:
+            key = ("upload", getattr(source, "file_id", None) or id(source), getattr(source, "name", None), source_size(source))
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = file_digest(source)
+        return digest
+
+    def load(self, source, name=None):
+        digest = self.digest(source)
+        with self._lock:
+            dataset = self.items.get(digest)
+            if dataset is not None:
+                self.items.move_to_end(digest)
+                self.stats["hits"] += 1
+                return dataset
+        dataset = self._read(source, digest, name or getattr(source, "name", None) or str(source))
+        with self._lock:
+            self.items[digest] = dataset
+            self.stats["misses"] += 1
+            self._evict()
+        return dataset
+
+    def register_frame(self, frame, name):
+        # Keeps an already-built DataFrame (e.g. a scraped table) under its content hash, with an
+        # Arrow IPC copy on disk so it can be reopened memory-mapped after eviction
+        digest = frame_digest(frame)
+        path = self.directory / f"{digest}.arrow"
+        if not path.exists():
+            try:
+                write_arrow(frame, path)
+            except ImportError:
+                path = None
+        with self._lock:
+            if digest not in self.items:
+                self.items[digest] = Dataset(digest, name, frame=frame, path=path)
+            self.items.move_to_end(digest)
+            self._evict()
+        return digest
+
+    def get(self, digest, name=None):
+        with self._lock:
+            dataset = self.items.get(digest)
+            if dataset is not None:
+                self.items.move_to_end(digest)
+                self.stats["hits"] += 1
+                return dataset
+        arrow, spill = self.directory / f"{digest}.arrow", self.directory / f"{digest}.parquet"
+        if arrow.exists():
+            dataset = Dataset(digest, name or digest, frame=read_arrow(arrow), path=arrow)
+        elif spill.exists():
+            dataset = Dataset(digest, name or digest, path=spill)
+        else:
+            return None
+        with self._lock:
+            self.items[digest] = dataset
+            self.stats["misses"] += 1
+            self._evict()
+        return dataset
+
+    def _read(self, source, digest, name):
+        spill = self.directory / f"{digest}.parquet"
+        if spill.exists():
+            os.utime(spill)
+            return Dataset(digest, name, path=spill)
+        if source_size(source) > memory_budget() * SPILL_FRACTION:
+            spill_csv(source, spill)
+            self.stats["spilled"] += 1
+            return Dataset(digest, name, path=spill)
+        return Dataset(digest, name, frame=optimize_frame(read_csv(source)))
+
+    def _evict(self):
+        while len(self.items) > 1 and (len(self.items) > self.max_datasets or
+                                       sum(d.nbytes() for d in self.items.values()) > self.max_bytes):
+            self.items.popitem(last=False)
+            self.stats["evicted"] += 1
+        # Spill and Arrow files outlive the in-memory entry so reopening skips the conversion
+        if not self.directory.exists():
+            return
+        in_use = {d.path for d in self.items.values() if d.path}
+        spills = sorted([*self.directory.glob("*.parquet"), *self.directory.glob("*.arrow")], key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in spills)
+        for path in spills:
+            if total <= MAX_SPILL_BYTES:
+                break
+            if path not in in_use:
+                total -= path.stat().st_size
+                path.unlink(missing_ok=True)
+
+    def report(self):
+        with self._lock:
+            return {**self.stats, "datasets": len(self.items), "bytes": sum(d.nbytes() for d in self.items.values())}
+
+
+_datasets = None
+_datasets_lock = threading.Lock()
+
+
+def get_datasets():
+    global _datasets
+    with _datasets_lock:
+        if _datasets is None:
+            _datasets = DatasetCache()
+    return _datasets
@@ -0,0 +1,279 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+from instrumentation import span
+
+POOL_SIZE = 2
+MAX_USES = 50
+LEASE_TIMEOUT = 120
+
+# URL patterns handed to CDP Network.setBlockedURLs for each resource type
+RESOURCE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+    "media": ["*.mp4", "*.webm", "*.ogg", "*.ogv", "*.mp3", "*.wav", "*.m3u8"],
+    "ads": ["*doubleclick.net*", "*googlesyndication.com*", "*google-analytics.com*", "*googletagmanager.com*", "*adservice.google.*"],
+}
+RESOURCE_TYPES = list(RESOURCE_PATTERNS)
+
+# We only read page_source, so nothing that merely paints the page needs to be downloaded.
+# Blocked <img>/<video>/<audio> elements keep their src attributes in the DOM.
+RENDER_PROFILES = {
+    "full": {"block_types": [], "block_patterns": [], "images": True, "page_load_strategy": "normal"},
+    "light": {"block_types": RESOURCE_TYPES, "block_patterns": [], "images": False, "page_load_strategy": "eager"},
+    "minimal": {"block_types": RESOURCE_TYPES, "block_patterns": [], "images": False, "page_load_strategy": "none"},
+}
+DEFAULT_PROFILE = "light"
+
+TRANSFER_SIZE_SCRIPT = """
+var total = 0;
+performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource')).forEach(function (entry) {
+    total += entry.transferSize || 0;
+});
+return total;
+"""
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def _webdriver_error():
+    # Used as `except _webdriver_error():`, which is only evaluated once something has been raised,
+    # so selenium stays unimported until a browser is actually in use
+    from selenium.common.exceptions import WebDriverException
+    return WebDriverException
+
+
+def get_driver_path():
+    # ChromeDriverManager().install() hits the network and the disk, so resolve it once per process
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+
+def blocked_patterns(profile):
+    patterns = [pattern for kind in profile.get("block_types", []) for pattern in RESOURCE_PATTERNS[kind]]
+    return patterns + list(profile.get("block_patterns", []))
+
+
+def apply_blocking(driver, profile):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns(profile)})
+
+
+def transferred_bytes(driver):
+    try:
+        return driver.execute_script(TRANSFER_SIZE_SCRIPT) or 0
+    except _webdriver_error():
+        return 0
+
+
+def get_driver(profile=None):
+    # Selenium is only imported once a browser is needed, so pages that never render one start faster
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    profile = profile or RENDER_PROFILES["full"]
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.page_load_strategy = profile.get("page_load_strategy", "normal")
+    if not profile.get("images", True):
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    with span("driver.launch"):
+        driver = webdriver.Chrome(service=Service(get_driver_path()), options=options)
+        apply_blocking(driver, profile)
+    return driver
+
+
+def _launch_settings(profile):
+    return profile.get("images", True), profile.get("page_load_strategy", "normal")
+
+
+class DriverPool:
+    def __init__(self, max_size=POOL_SIZE, max_uses=MAX_USES, lease_timeout=LEASE_TIMEOUT, profile=None):
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        # Image loading and page-load strategy are fixed when Chrome starts, so every profile leased
+        # from this pool shares them (see get_pool); blocked URLs are applied per lease
+        self.profile = dict(profile or RENDER_PROFILES[DEFAULT_PROFILE])
+        # Idle browsers, most recently used last; waiters sleep on _available until a browser is
+        # released or a slot is freed by a discard
+        self._idle = []
+        self._uses = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self.stats = {"leases": 0, "hits": 0, "misses": 0, "recycled": 0, "crashed": 0, "wait_time": 0.0}
+
+    def _is_alive(self, driver):
+        try:
+            driver.current_url
+            return True
+        except _webdriver_error():
+            return False
+
+    def _discard(self, driver, reason=None):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except _webdriver_error():
+            pass
+        with self._available:
+            if reason:
+                self.stats[reason] += 1
+            self._size -= 1
+            self._available.notify()
+
+    def _reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        # delete_all_cookies() and window.localStorage only reach the current origin; CDP clears
+        # cookies and stored data for every site the previous lease visited
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"})
+        try:
+            # sessionStorage belongs to the tab rather than the profile, so CDP leaves it alone
+            driver.execute_script("window.sessionStorage.clear();")
+        except _webdriver_error():
+            # Storage is not accessible on some origins (about:blank, data: URLs)
+            pass
+        driver.get("about:blank")
+
+    def _take(self, deadline):
+        # An idle browser, or None once a slot for a new one has been reserved
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser became available within {self.lease_timeout}s")
+                self._available.wait(remaining)
+
+    def acquire(self, profile=None):
+        profile = profile or self.profile
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            driver = self._take(deadline)
+            hit = driver is not None
+            if not hit:
+                try:
+                    driver = get_driver(profile)
+                except Exception:
+                    with self._available:
+                        self._size -= 1
+                        self._available.notify()
+                    raise
+                break
+            if not self._is_alive(driver):
+                self._discard(driver, "crashed")
+                continue
+            try:
+                apply_blocking(driver, profile)
+            except _webdriver_error():
+                self._discard(driver, "crashed")
+                continue
+            break
+
+        with self._lock:
+            self.stats["leases"] += 1
+            self.stats["hits" if hit else "misses"] += 1
+            self.stats["wait_time"] += time.perf_counter() - start
+        return driver
+
+    def release(self, driver, broken=False):
+        uses = self._uses.get(id(driver), 0) + 1
+        if broken:
+            self._discard(driver, "crashed")
+            return
+        if uses >= self.max_uses:
+            self._discard(driver, "recycled")
+            return
+        try:
+            self._reset(driver)
+        except _webdriver_error():
+            self._discard(driver, "crashed")
+            return
+        self._uses[id(driver)] = uses
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    @contextmanager
+    def lease(self, profile=None):
+        with span("driver.acquire"):
+            driver = self.acquire(profile)
+        broken = False
+        try:
+            yield driver
+        except _webdriver_error():
+            broken = not self._is_alive(driver)
+            raise
+        finally:
+            self.release(driver, broken)
+
+    def report(self):
+        leases = self.stats["leases"]
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "leases": leases,
+            "hit_rate": self.stats["hits"] / leases if leases else 0.0,
+            "avg_wait": self.stats["wait_time"] / leases if leases else 0.0,
+            "recycled": self.stats["recycled"],
+            "crashed": self.stats["crashed"],
+        }
+
+    def close(self):
+        while True:
+            with self._available:
+                if not self._idle:
+                    break
+                driver = self._idle.pop()
+            self._discard(driver)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_default_profile = RENDER_PROFILES[DEFAULT_PROFILE]
+
+
+def set_default_profile(profile):
+    # For callers that do not pass a profile of their own, such as the CLI's --render-profile
+    global _default_profile
+    _default_profile = dict(profile)
+
+
+def resolve_profile(profile=None):
+    return dict(profile or _default_profile)
+
+
+def get_pool(profile=None):
+    # One pool per launch settings, so sessions with different render profiles never relaunch
+    # each other's browsers. Module state survives Streamlit reruns, so warm browsers are shared across them.
+    profile = resolve_profile(profile)
+    key = _launch_settings(profile)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = DriverPool(profile=profile)
+            atexit.register(pool.close)
+    return pool
@@ -0,0 +1,157 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+
+EXPORT_FORMATS = ["csv", "jsonl", "parquet"]
+
+# Flat categories and their columns; tables are written one file per table
+CATEGORIES = {
+    "headlines": ["url", "text"],
+    "links": ["url", "link"],
+    "images": ["url", "src"],
+    "videos": ["url", "src"],
+    "audios": ["url", "src"],
+    "tags": ["url", "tag", "text"],
+    "paragraphs": ["url", "text"],
+}
+
+
+def page_rows(url, results):
+    tables, headlines, links, media, tags_data, p_tags_data = results
+    yield "headlines", ([url, text] for text in headlines)
+    yield "links", ([url, link] for link in links)
+    for kind in ("images", "videos", "audios"):
+        yield kind, ([url, src] for src in media[kind])
+    yield "tags", ([url, tag, text] for tag, texts in tags_data.items() for text in texts)
+    yield "paragraphs", ([url, text] for text in p_tags_data)
+
+
+class _CsvSink:
+    def __init__(self, path, columns):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class _JsonlSink:
+    def __init__(self, path, columns):
+        self.file = open(path, "w", encoding="utf-8", newline="\n")
+        self.columns = columns
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetSink:
+    # One row group per page keeps only the current page's rows in memory
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(column, pa.string()) for column in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        arrays = [self.pa.array([row[i] for row in rows], self.pa.string()) for i in range(len(self.columns))]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+SINKS = {"csv": _CsvSink, "jsonl": _JsonlSink, "parquet": _ParquetSink}
+
+
+def _write_table(df, path, fmt):
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "jsonl":
+        # ISO dates, the same as core.results_to_dict, rather than epoch milliseconds
+        df.to_json(path, orient="records", lines=True, force_ascii=False, date_format="iso")
+    else:
+        # Parquet needs string column names and a consistent type per column; typed columns are
+        # written as they are, so numbers, dates and missing values survive the round trip
+        df = df.copy()
+        df.columns = [str(column) for column in df.columns]
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].astype("string")
+        df.to_parquet(path, index=False)
+
+
+class ExportWriter:
+    def __init__(self, directory, fmt="csv"):
+        if fmt not in SINKS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.sinks = {}
+        self.pages = 0
+        self.index = []
+
+    def _sink(self, category):
+        if category not in self.sinks:
+            path = self.directory / f"{category}.{self.fmt}"
+            self.sinks[category] = SINKS[self.fmt](path, CATEGORIES[category])
+        return self.sinks[category]
+
+    def write_page(self, url, results):
+        self.pages += 1
+        # Only one page's rows are ever held here; files are opened the first time a category has data
+        for category, rows in page_rows(url, results):
+            rows = list(rows)
+            if rows:
+                self._sink(category).write(rows)
+        for i, df in enumerate(results[0], 1):
+            name = f"table_{self.pages}_{i}.{self.fmt}"
+            _write_table(df, self.directory / name, self.fmt)
+            self.index.append([url, i, name, len(df), len(df.columns)])
+
+    def close(self):
+        for sink in self.sinks.values():
+            sink.close()
+        if self.index:
+            with open(self.directory / "tables_index.csv", "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["url", "table", "file", "rows", "columns"])
+                writer.writerows(self.index)
+
+
+def export_to_directory(pages, directory, fmt="csv"):
+    writer = ExportWriter(directory, fmt)
+    try:
+        for url, results in pages:
+            writer.write_page(url, results)
+    finally:
+        writer.close()
+    return Path(directory)
+
+
+def export_bundle(pages, fmt="csv"):
+    # Files are streamed to a scratch directory first and then deflated into the zip one by one
+    workdir = Path(tempfile.mkdtemp(prefix="scrape_export_"))
+    try:
+        export_to_directory(pages, workdir / "data", fmt)
+        fd, bundle = tempfile.mkstemp(prefix="scraped_data_", suffix=".zip")
+        os.close(fd)
+        with zipfile.ZipFile(bundle, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for path in sorted((workdir / "data").iterdir()):
+                zf.write(path, path.name)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return bundle
@@ -0,0 +1,141 @@
+from instrumentation import span
+from parsers import default_backend, parse_html
+
+def scrape_tables(soup):
+    return build_tables(soup.find_all("table", {"class": "wikitable"}))
+
+def build_tables(tables):
+    # pandas is loaded with the first table rather than with the extractors
+    from tables import parse_table
+    return [parse_table(table) for table in tables]
+
+def scrape_headlines_func(soup, scrape_headlines, selected_headlines_tags):
+    if not scrape_headlines:
+        return []
+    headlines = []
+    for tag in selected_headlines_tags:
+        headline_tags = soup.find_all(tag)
+        headlines += [tag.text.strip() for tag in headline_tags]
+    return headlines
+
+def scrape_links_func(soup, scrape_links):
+    if not scrape_links:
+        return []
+    anchor_tags = soup.find_all("a", href=True)
+    return [a['href'] for a in anchor_tags if a['href'].startswith("http")]
+
+def scrape_media_func(soup, scrape_media):
+    if not scrape_media:
+        return {"images": [], "videos": [], "audios": []}
+    media = {
+        "images": [img['src'] for img in soup.find_all("img", src=True)],
+        "videos": [video['src'] for video in soup.find_all("video", src=True)],
+        "audios": [audio['src'] for audio in soup.find_all("audio", src=True)]
+    }
+    return media
+
+def scrape_tags_func(soup, scrape_tags):
+    if not scrape_tags:
+        return {}
+    tags_data = {}
+    for tag in scrape_tags:
+        tags = soup.find_all(tag)
+        tags_data[tag] = [t.text.strip() for t in tags]
+    return tags_data
+
+def scrape_p_tags_func(soup, scrape_p_tags):
+    if not scrape_p_tags:
+        return []
+    p_tags = soup.find_all("p")
+    return [p.text.strip() for p in p_tags]
+
+MEDIA_TAGS = {"img": "images", "video": "videos", "audio": "audios"}
+
+def compile_extractors(scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags):
+    # Map each tag name to the (kind, bucket) pairs that want it, so one walk can feed every extractor
+    dispatch = {}
+
+    def want(tag, kind, bucket):
+        handlers = dispatch.setdefault(tag, [])
+        if (kind, bucket) not in handlers:
+            handlers.append((kind, bucket))
+
+    want("table", "table", "tables")
+    if scrape_headlines:
+        for tag in selected_headlines_tags:
+            want(tag, "text", ("headline", tag))
+    if scrape_links:
+        want("a", "link", "links")
+    if scrape_media:
+        for tag, bucket in MEDIA_TAGS.items():
+            want(tag, "src", bucket)
+    for tag in scrape_tags or []:
+        want(tag, "text", ("tag", tag))
+    if scrape_p_tags:
+        want("p", "text", "p")
+    return dispatch
+
+def walk_once(soup, dispatch):
+    buckets = {bucket: [] for handlers in dispatch.values() for _, bucket in handlers}
+    for element in soup.find_all(True):
+        handlers = dispatch.get(element.name)
+        if handlers is None:
+            continue
+        text = None
+        for kind, bucket in handlers:
+            if kind == "text":
+                # The same <p> can feed both the tag and paragraph extractors; strip its text once
+                if text is None:
+                    text = element.text.strip()
+                buckets[bucket].append(text)
+            elif kind == "link":
+                href = element.get("href")
+                if href is not None and href.startswith("http"):
+                    buckets[bucket].append(href)
+            elif kind == "src":
+                src = element.get("src")
+                if src is not None:
+                    buckets[bucket].append(src)
+            elif kind == "table":
+                if "wikitable" in (element.get("class") or []):
+                    buckets[bucket].append(element)
+    return buckets
+
+def restrict_dispatch(dispatch, buckets):
+    restricted = {}
+    for tag, handlers in dispatch.items():
+        wanted = [(kind, bucket) for kind, bucket in handlers if bucket in buckets]
+        if wanted:
+            restricted[tag] = wanted
+    return restricted
+
+def extract_buckets(soup, dispatch):
+    # Every extractor shares one walk, so the walk is timed as a whole; tables are the costly part after it
+    with span("extract.walk", tags=len(dispatch)):
+        buckets = walk_once(soup, dispatch)
+    if "tables" in buckets:
+        with span("extract.tables", tables=len(buckets["tables"])):
+            buckets["tables"] = build_tables(buckets["tables"])
+    return buckets
+
+def assemble_results(buckets, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags):
+    tables = buckets["tables"]
+    headlines = []
+    if scrape_headlines:
+        for tag in selected_headlines_tags:
+            headlines += buckets[("headline", tag)]
+    links = buckets["links"] if scrape_links else []
+    media = {bucket: buckets[bucket] if scrape_media else [] for bucket in MEDIA_TAGS.values()}
+    tags_data = {tag: buckets[("tag", tag)] for tag in scrape_tags or []}
+    p_tags_data = buckets["p"] if scrape_p_tags else []
+    return tables, headlines, links, media, tags_data, p_tags_data
+
+def extract_page(soup, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags):
+    dispatch = compile_extractors(scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+    buckets = extract_buckets(soup, dispatch)
+    return assemble_results(buckets, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+
+def parse_and_extract(html, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, parser=None):
+    # Entry point for worker processes: takes raw HTML so only strings cross the process boundary
+    soup = parse_html(html, parser or default_backend())
+    return extract_page(soup, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
@@ -0,0 +1,203 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from driver_pool import get_pool, resolve_profile, transferred_bytes
+from instrumentation import span
+from page_cache import get_cache
+from parsers import default_backend, parse_html
+from readiness import DEFAULT_POLICY, DEFAULT_TIMEOUT, wait_until_ready
+
+HTTP_TIMEOUT = 15
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0 Safari/537.36"
+
+# Markers left behind by client-side frameworks when the server only sends an app shell
+JS_SHELL_MARKERS = ['id="root"', 'id="app"', 'id="__next"', 'id="__nuxt"', "ng-app", "data-reactroot"]
+MIN_BODY_TEXT = 200
+
+fetch_log = deque(maxlen=500)
+
+_local = threading.local()
+
+
+def get_session():
+    # One keep-alive session per thread; requests.Session is not safe to share between threads
+    session = getattr(_local, "session", None)
+    if session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = USER_AGENT
+        _local.session = session
+    return session
+
+
+# What each optional extractor reads; the page counts as ready once any selected one is present
+LINK_SELECTOR = "a[href]"
+MEDIA_SELECTOR = "img, video, audio"
+
+
+def required_selectors(scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags):
+    # Takes the same option tuple as the scrape_* functions. Tables are always extracted, so
+    # table.wikitable is always one of the selectors; with none at all, readiness falls back
+    # to document.readyState
+    selectors = ["table.wikitable"]
+    if scrape_headlines:
+        selectors += list(selected_headlines_tags)
+    if scrape_links:
+        selectors.append(LINK_SELECTOR)
+    if scrape_media:
+        selectors.append(MEDIA_SELECTOR)
+    selectors += list(scrape_tags)
+    if scrape_p_tags:
+        selectors.append("p")
+    return list(dict.fromkeys(selectors))
+
+
+def host_of(url):
+    return (urlparse(url).hostname or "").lower()
+
+
+def is_browser_domain(url, browser_domains):
+    host = host_of(url)
+    return any(host == d or host.endswith("." + d) for d in browser_domains)
+
+
+def looks_js_rendered(html, soup):
+    body = soup.body
+    if body is None:
+        return True
+    if len(body.get_text(" ", strip=True)) < MIN_BODY_TEXT:
+        return True
+    head = html[:20000]
+    return any(marker in head for marker in JS_SHELL_MARKERS) and not soup.find("p")
+
+
+def render_reason(html, soup, selectors):
+    # Why an HTTP response should be re-fetched in the browser, or "" when it can be used as is
+    missing = [s for s in selectors if soup.select_one(s) is None]
+    if missing and looks_js_rendered(html, soup):
+        return "looks JS-rendered, missing " + ", ".join(missing)
+    return ""
+
+
+def fetch_static(url, cached_entry=None):
+    headers = {}
+    if cached_entry:
+        if cached_entry["etag"]:
+            headers["If-None-Match"] = cached_entry["etag"]
+        if cached_entry["last_modified"]:
+            headers["If-Modified-Since"] = cached_entry["last_modified"]
+    response = get_session().get(url, timeout=HTTP_TIMEOUT, headers=headers)
+    if response.status_code == 304:
+        return None, response
+    response.raise_for_status()
+    return response.text, response
+
+
+def fetch_static_cached(url, cache, record, use_cache=True, cache_ttl=None):
+    cached_html, entry = cache.lookup(url, "http", cache_ttl) if use_cache else (None, None)
+    if entry and entry["fresh"]:
+        cache.touch(url, "http")
+        record["cache"] = "hit"
+        return cached_html
+    with span("http.fetch"):
+        html, response = fetch_static(url, entry)
+    if html is None:
+        cache.touch(url, "http", revalidated=True)
+        record["cache"] = "revalidated"
+        return cached_html
+    if use_cache:
+        cache.store(url, "http", html, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        record["cache"] = "miss"
+    return html
+
+
+def fetch_browser(url, selectors=(), readiness=None, render_profile=None):
+    readiness = readiness or {}
+    profile = resolve_profile(render_profile)
+    with get_pool(profile).lease(profile) as driver:
+        start = time.perf_counter()
+        with span("browser.navigate"):
+            driver.get(url)
+        policy = readiness.get("policy", DEFAULT_POLICY)
+        with span("browser.wait", policy=policy):
+            ready, waited = wait_until_ready(driver, policy, selectors, readiness.get("timeout", DEFAULT_TIMEOUT))
+        render = time.perf_counter() - start
+        return driver.page_source, ready, waited, render, transferred_bytes(driver)
+
+
+def fetch_page(url, selectors=(), browser_domains=(), readiness=None, parser=None, use_cache=True, render_profile=None,
+               cache_ttl=None, check=True, reason=None):
+    # check=False returns the HTTP response unparsed and leaves render_reason() to the caller; batch and
+    # crawl run it in their parse workers so each page is parsed once. A reason skips HTTP and renders.
+    import requests
+
+    start = time.perf_counter()
+    record = {"url": url, "method": "browser", "reason": "", "latency": 0.0, "wait": 0.0, "ready": True, "cache": None,
+              "render": 0.0, "bytes": 0}
+    cache = get_cache()
+    # use_cache and cache_ttl are per call (one app session or job); cache.enabled switches the cache off for the whole process
+    use_cache = use_cache and cache.enabled
+    html = None
+    soup = None
+
+    if reason:
+        record["reason"] = reason
+    elif is_browser_domain(url, browser_domains):
+        record["reason"] = "browser domain"
+    else:
+        try:
+            html = fetch_static_cached(url, cache, record, use_cache, cache_ttl)
+            if check:
+                backend = parser or default_backend()
+                with span("parse", backend=backend):
+                    soup = parse_html(html, backend)
+                record["reason"] = render_reason(html, soup, selectors)
+            if record["reason"]:
+                html = soup = None
+            else:
+                record["method"] = "http"
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # Only a server that could not be reached is worth a browser; an HTTP error status
+            # (404, 500, ...) is the answer the browser would get too, so it is raised as is
+            record["reason"] = f"HTTP failed: {e}"
+            html = soup = None
+
+    if html is None:
+        # Rendered pages carry no validators worth trusting, so they are only reused while fresh
+        cached_html, entry = cache.lookup(url, "browser", cache_ttl) if use_cache else (None, None)
+        if entry and entry["fresh"]:
+            cache.touch(url, "browser")
+            html = cached_html
+            record["cache"] = "hit"
+        else:
+            html, record["ready"], record["wait"], record["render"], record["bytes"] = fetch_browser(url, selectors, readiness, render_profile)
+            if use_cache:
+                cache.store(url, "browser", html)
+                record["cache"] = "miss"
+
+    record["latency"] = time.perf_counter() - start
+    fetch_log.append(record)
+    return html, soup, record
+
+
+def fetch_summary():
+    http = [r["latency"] for r in fetch_log if r["method"] == "http"]
+    browser = [r["latency"] for r in fetch_log if r["method"] == "browser" and r["cache"] != "hit"]
+    avg_browser = sum(browser) / len(browser) if browser else None
+    return {
+        "http": len(http),
+        "browser": len(browser),
+        "avg_http": sum(http) / len(http) if http else 0.0,
+        "avg_browser": avg_browser or 0.0,
+        "avg_bytes": sum(r["bytes"] for r in fetch_log if r["method"] == "browser" and r["cache"] != "hit") / len(browser) if browser else 0.0,
+        "avg_wait": sum(r["wait"] for r in fetch_log if r["method"] == "browser" and r["cache"] != "hit") / len(browser) if browser else 0.0,
+        # Only meaningful once at least one page has gone through the browser
+        "browser_time_avoided": (avg_browser * len(http) - sum(http)) if avg_browser else 0.0,
+    }
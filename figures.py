@@ -0,0 +1,120 @@
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from column_profile import get_profile
+
+PAIRPLOT_SAMPLE = 2000
+MAX_PAIRPLOT_COLUMNS = 8
+MAX_HUE_VALUES = 20
+MAX_ANNOTATED_COLUMNS = 20
+FIGURE_WORKERS = 1
+MAX_FIGURES = 32
+
+
+def stratified_sample(frame, column, size, seed=0):
+    # Proportional per stratum, but every stratum keeps at least one row so small groups still show
+    groups = frame.groupby(column, observed=True, dropna=False)
+    parts = [group.sample(min(len(group), max(1, round(size * len(group) / len(frame)))), random_state=seed) for _, group in groups]
+    return pd.concat(parts) if parts else frame.head(0)
+
+
+def pairplot_sample(dataset, columns, size=PAIRPLOT_SAMPLE, hue=None):
+    wanted = list(dict.fromkeys([*columns, *([hue] if hue else [])]))
+    # Spilled datasets are sampled while streaming; in memory we sample the frame directly
+    frame = dataset.frame[wanted] if dataset.in_memory else dataset.sample(size * 4, wanted)
+    if len(frame) <= size:
+        return frame
+    if hue:
+        return stratified_sample(frame, hue, size)
+    return frame.sample(size, random_state=0)
+
+
+def _png(figure):
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def render_heatmap(corr):
+    # Drawn on a standalone Figure rather than pyplot, whose global state is not thread-safe
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(max(6, len(corr) * 0.6), max(4, len(corr) * 0.5)))
+    ax = figure.subplots()
+    sns.heatmap(corr, annot=len(corr) <= MAX_ANNOTATED_COLUMNS, fmt=".2f", cmap="coolwarm", vmin=-1, vmax=1, ax=ax)
+    return _png(figure)
+
+
+def render_pairplot(sample, columns, hue=None):
+    # A scatter matrix with histograms on the diagonal; seaborn's pairplot goes through pyplot
+    from matplotlib.figure import Figure
+
+    size = len(columns)
+    figure = Figure(figsize=(2.2 * size, 2.2 * size))
+    axes = figure.subplots(size, size, squeeze=False)
+    groups = [(None, sample)] if hue is None else list(sample.groupby(hue, observed=True))
+    for row, y in enumerate(columns):
+        for col, x in enumerate(columns):
+            ax = axes[row][col]
+            for label, group in groups:
+                if row == col:
+                    ax.hist(group[x].dropna(), bins=20, alpha=0.6, label=label)
+                else:
+                    ax.scatter(group[x], group[y], s=6, alpha=0.5, label=label)
+            if row == size - 1:
+                ax.set_xlabel(x)
+            if col == 0:
+                ax.set_ylabel(y)
+    if hue is not None:
+        axes[0][size - 1].legend(title=hue, fontsize="small", loc="upper right")
+    return _png(figure)
+
+
+class FigureCache:
+    # PNGs keyed by (dataset hash, figure kind, columns, options). Rendering happens on a worker
+    # thread, so the page can show a placeholder and keep laying out while a figure is drawn.
+    def __init__(self, workers=FIGURE_WORKERS, max_figures=MAX_FIGURES):
+        self.max_figures = max_figures
+        self.items = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="figures")
+        self._lock = threading.Lock()
+
+    def request(self, key, render):
+        # Returns a Future; finished figures come back as an already-completed one
+        with self._lock:
+            future = self.items.get(key)
+            if future is not None:
+                self.items.move_to_end(key)
+                if not (future.done() and future.exception() is not None):
+                    return future
+            future = self._executor.submit(render)
+            self.items[key] = future
+            while len(self.items) > self.max_figures:
+                self.items.popitem(last=False)
+            return future
+
+    def heatmap(self, dataset):
+        profile = get_profile(dataset)
+        return self.request((dataset.digest, "heatmap"), lambda: render_heatmap(profile.corr()))
+
+    def pairplot(self, dataset, columns, size=PAIRPLOT_SAMPLE, hue=None):
+        columns = list(columns)[:MAX_PAIRPLOT_COLUMNS]
+        key = (dataset.digest, "pairplot", tuple(columns), size, hue)
+        return self.request(key, lambda: render_pairplot(pairplot_sample(dataset, columns, size, hue), columns, hue))
+
+
+_figures = None
+_figures_lock = threading.Lock()
+
+
+def get_figures():
+    global _figures
+    with _figures_lock:
+        if _figures is None:
+            _figures = FigureCache()
+    return _figures
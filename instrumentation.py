@@ -0,0 +1,130 @@
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+MAX_TRACES = 200
+MAX_SAMPLES = 1000
+QUANTILES = (0.5, 0.95, 0.99)
+METRICS_FORMATS = ["openmetrics", "jsonl"]
+
+traces = deque(maxlen=MAX_TRACES)
+
+_local = threading.local()
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_totals = defaultdict(lambda: {"count": 0, "seconds": 0.0, "blocks": 0})
+
+
+@contextmanager
+def span(name, **attrs):
+    # Times one stage and counts the memory blocks it left allocated. Spans opened inside a
+    # trace() on the same thread are kept for the breakdown; every span feeds the metrics.
+    depth = getattr(_local, "depth", 0)
+    record = {"name": name, "depth": depth, "seconds": 0.0, "blocks": 0, "alloc_kb": None, **attrs}
+    spans = getattr(_local, "spans", None)
+    if spans is not None:
+        spans.append(record)
+    tracing = tracemalloc.is_tracing()
+    traced = tracemalloc.get_traced_memory()[0] if tracing else 0
+    blocks = sys.getallocatedblocks()
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        record["blocks"] = sys.getallocatedblocks() - blocks
+        if tracing and tracemalloc.is_tracing():
+            record["alloc_kb"] = (tracemalloc.get_traced_memory()[0] - traced) / 1024
+        _local.depth = depth
+        with _lock:
+            _samples[name].append(record["seconds"])
+            totals = _totals[name]
+            totals["count"] += 1
+            totals["seconds"] += record["seconds"]
+            totals["blocks"] += record["blocks"]
+
+
+@contextmanager
+def trace(name, **attrs):
+    result = {"name": name, "time": time.time(), "seconds": 0.0, "spans": [], **attrs}
+    previous = getattr(_local, "spans", None)
+    _local.spans = result["spans"]
+    try:
+        with span(name):
+            yield result
+    finally:
+        _local.spans = previous
+        result["seconds"] = result["spans"][0]["seconds"]
+        _local.last = result
+        traces.append(result)
+
+
+def last_trace():
+    # The most recent trace finished on this thread, i.e. the scrape this Streamlit run just did
+    return getattr(_local, "last", None)
+
+
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def stage_summary():
+    with _lock:
+        samples = {name: sorted(values) for name, values in _samples.items()}
+        totals = {name: dict(values) for name, values in _totals.items()}
+    return {
+        name: {
+            "count": totals[name]["count"],
+            "mean": totals[name]["seconds"] / totals[name]["count"],
+            **{f"p{round(q * 100)}": _quantile(ordered, q) for q in QUANTILES},
+        }
+        for name, ordered in samples.items() if ordered
+    }
+
+
+def to_openmetrics():
+    # Quantiles cover the last MAX_SAMPLES runs of each stage; _count and _sum are cumulative
+    with _lock:
+        samples = {name: sorted(values) for name, values in _samples.items()}
+        totals = {name: dict(values) for name, values in _totals.items()}
+    lines = [
+        "# TYPE scrape_stage_seconds summary",
+        "# HELP scrape_stage_seconds Wall time spent in each scraping stage.",
+    ]
+    for name, ordered in sorted(samples.items()):
+        for q in QUANTILES:
+            lines.append(f'scrape_stage_seconds{{stage="{name}",quantile="{q}"}} {_quantile(ordered, q):.6f}')
+        lines.append(f'scrape_stage_seconds_count{{stage="{name}"}} {totals[name]["count"]}')
+        lines.append(f'scrape_stage_seconds_sum{{stage="{name}"}} {totals[name]["seconds"]:.6f}')
+    # A net delta of sys.getallocatedblocks(), so it goes down as well as up: a gauge, not a counter.
+    # The block count is process-wide, so stages running concurrently on other threads blur it
+    lines += [
+        "# TYPE scrape_stage_allocated_blocks gauge",
+        "# HELP scrape_stage_allocated_blocks Net memory blocks left allocated by each scraping stage, summed over runs. "
+        "Process-wide, so noisy while requests run concurrently.",
+    ]
+    for name, values in sorted(totals.items()):
+        lines.append(f'scrape_stage_allocated_blocks{{stage="{name}"}} {values["blocks"]}')
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def to_jsonl(records=None):
+    return "".join(json.dumps(record, default=str) + "\n" for record in (traces if records is None else records))
+
+
+def export_metrics(path, fmt="openmetrics"):
+    if fmt not in METRICS_FORMATS:
+        raise ValueError(f"Unknown metrics format: {fmt}")
+    if fmt == "jsonl":
+        # Appends, so one file collects traces across many runs
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(to_jsonl())
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(to_openmetrics())
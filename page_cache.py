@@ -0,0 +1,150 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent / ".page_cache"
+DEFAULT_TTL = 3600
+MAX_BYTES = 512 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (url, mode)
+)
+"""
+
+
+class PageCache:
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=MAX_BYTES):
+        self.directory = Path(directory)
+        self.blobs = self.directory / "blobs"
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "index.sqlite3", check_same_thread=False)
+        self._db.execute(SCHEMA)
+        self._db.commit()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+
+    def _blob_path(self, digest):
+        return self.blobs / digest[:2] / f"{digest}.z"
+
+    def lookup(self, url, mode, ttl=None):
+        # Returns (html, entry) for a cached page, or (None, None); entry["fresh"] tells whether the TTL still holds.
+        # ttl overrides the cache-wide default for this lookup only, so each session or job can set its own
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, etag, last_modified, fetched_at FROM pages WHERE url = ? AND mode = ?", (url, mode)
+            ).fetchone()
+        if row is None:
+            return None, None
+        digest, etag, last_modified, fetched_at = row
+        try:
+            html = zlib.decompress(self._blob_path(digest).read_bytes()).decode("utf-8")
+        except (OSError, zlib.error):
+            self.forget(url, mode)
+            return None, None
+        entry = {"etag": etag, "last_modified": last_modified, "fresh": time.time() - fetched_at < (self.ttl if ttl is None else ttl)}
+        return html, entry
+
+    def touch(self, url, mode, revalidated=False):
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._db.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ? AND mode = ?", (now, now, url, mode))
+                self.stats["revalidated"] += 1
+            else:
+                self._db.execute("UPDATE pages SET accessed_at = ? WHERE url = ? AND mode = ?", (now, url, mode))
+            self._db.commit()
+            self.stats["hits"] += 1
+
+    def store(self, url, mode, html, etag=None, last_modified=None):
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        compressed = zlib.compress(data, 6)
+        now = time.time()
+        with self._lock:
+            # Identical pages under different URLs or render modes share one compressed blob
+            if not path.exists():
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(compressed)
+                tmp.replace(path)
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, mode, digest, len(compressed), etag, last_modified, now, now),
+            )
+            self._db.commit()
+            self.stats["stored"] += 1
+            self.stats["misses"] += 1
+        self.evict()
+
+    def forget(self, url, mode):
+        with self._lock:
+            self._db.execute("DELETE FROM pages WHERE url = ? AND mode = ?", (url, mode))
+            self._db.commit()
+        self._remove_orphans()
+
+    def evict(self):
+        # Drop least recently used entries until the distinct blobs fit in max_bytes
+        with self._lock:
+            rows = self._db.execute("SELECT url, mode, digest, size FROM pages ORDER BY accessed_at DESC").fetchall()
+            seen = set()
+            total = 0
+            doomed = []
+            for url, mode, digest, size in rows:
+                if digest not in seen:
+                    seen.add(digest)
+                    total += size
+                if total > self.max_bytes:
+                    doomed.append((url, mode))
+            if not doomed:
+                return
+            self._db.executemany("DELETE FROM pages WHERE url = ? AND mode = ?", doomed)
+            self._db.commit()
+            self.stats["evicted"] += len(doomed)
+        self._remove_orphans()
+
+    def _remove_orphans(self):
+        with self._lock:
+            live = {row[0] for row in self._db.execute("SELECT DISTINCT digest FROM pages")}
+            for path in self.blobs.glob("*/*.z"):
+                if path.stem not in live:
+                    path.unlink(missing_ok=True)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM pages")
+            self._db.commit()
+        self._remove_orphans()
+
+    def report(self):
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return dict(self.stats, entries=entries, size=size, hit_rate=self.stats["hits"] / lookups if lookups else 0.0)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+    return _cache
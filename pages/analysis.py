@@ -1,50 +1,132 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 st.title("Dataset Analysis App")
 
 # Sidebar for file upload
 st.sidebar.header("Upload Dataset")
 uploaded_file = st.sidebar.file_uploader("Choose a CSV file", type="csv")
+# Files too large to upload through the browser can be opened from the app's data/ directory
+csv_path = st.sidebar.text_input("Or open a CSV file from the data folder (file name):")
+# Tables scraped in this session, registered by the main page
+scraped_tables = st.session_state.get("datasets", {})
+scraped_name = st.sidebar.selectbox("Or open a scraped table:", ["(none)", *scraped_tables]) if scraped_tables else "(none)"
+
+def filter_predicate(dataset, column):
+    from column_index import OPERATORS, VALUES_PAGE_SIZE, get_index
+
+    index = get_index(dataset, column)
+    operators = OPERATORS if index.numeric else [op for op in OPERATORS if op != "between"]
+    operator = st.sidebar.selectbox(f"Filter {column}:", operators, key=f"filter_op_{column}")
+    if operator == "is missing":
+        return column, operator, None
+    if operator == "between":
+        lower, upper = index.bounds()
+        if lower is None:
+            return column, operator, (0, 0)
+        if lower == upper:
+            # A slider needs min < max; with a single value there is no range to pick
+            st.sidebar.caption(f"Every {column} value is {lower}")
+            return column, operator, (float(lower), float(upper))
+        return column, operator, st.sidebar.slider(f"{column} range:", float(lower), float(upper), (float(lower), float(upper)), key=f"filter_range_{column}")
+    # Values are searched and paged rather than listing every distinct value in one widget
+    search = st.sidebar.text_input(f"Search {column} values:", key=f"filter_search_{column}")
+    _, total = index.values(search, 0, 0)
+    pages = max(1, -(-total // VALUES_PAGE_SIZE))
+    page = st.sidebar.number_input(f"Page of values (1-{pages}):", 1, pages, 1, key=f"filter_page_{column}") - 1
+    shown, _ = index.values(search, page)
+    counts = dict(zip(shown["value"], shown["count"]))
+    label = lambda value: f"{value} ({counts[value]:,})" if value in counts else str(value)
+    if operator == "equals":
+        return column, operator, st.sidebar.selectbox("Select a value", list(counts), format_func=label, key=f"filter_value_{column}")
+    key = f"filter_values_{column}"
+    # Keep values picked on other pages selectable so paging does not drop them
+    options = list(dict.fromkeys(st.session_state.get(key, []) + list(counts)))
+    return column, operator, st.sidebar.multiselect("Select values", options, format_func=label, key=key)
+
+def describe_predicate(column, operator, value):
+    if operator == "equals":
+        return f"{column} = {value}"
+    if operator == "one of":
+        return f"{column} in {list(value)}"
+    if operator == "between":
+        return f"{value[0]} <= {column} <= {value[1]}"
+    return f"{column} is missing"
+
+def open_dataset():
+    # pandas and pyarrow come in with the first dataset, not with the page
+    from datasets import data_path, get_datasets
+
+    if scraped_name != "(none)":
+        return get_datasets().get(scraped_tables[scraped_name], scraped_name)
+    if uploaded_file is not None:
+        source = uploaded_file
+    else:
+        source = data_path(csv_path.strip()) if csv_path.strip() else None
+    # Parsed once per file content; reruns reuse the cached dataset
+    return get_datasets().load(source) if source is not None else None
+
+def show_figure(pending, future, message):
+    # Finished figures show at once; others get a placeholder that is filled once the page is laid out
+    if future.done():
+        st.image(future.result())
+    else:
+        placeholder = st.empty()
+        placeholder.info(message)
+        pending.append((placeholder, future))
 
 def home_page():
- if uploaded_file is not None:
+ if uploaded_file is not None or csv_path.strip() or scraped_name != "(none)":
     try:
-        # Read the uploaded file
-        df = pd.read_csv(uploaded_file)
-        st.success("File uploaded successfully!")
+        from column_index import query
+        from column_profile import get_profile
+        from figures import MAX_HUE_VALUES, MAX_PAIRPLOT_COLUMNS, PAIRPLOT_SAMPLE, get_figures
+
+        dataset = open_dataset()
+        if dataset is None:
+            st.warning("This scraped table is no longer available. Scrape the page again to reopen it.")
+            return
+        # Every statistic below comes from one cached scan of the dataset
+        profile = get_profile(dataset)
+        pending = []
+        # The plots below need a DataFrame; for large files they get a sample
+        df = dataset.frame if dataset.in_memory else dataset.sample()
+        st.success(f"Opened {dataset.name}")
+        if not dataset.in_memory:
+            st.info(f"This file is larger than the in-memory limit, so it is read from a Parquet copy on disk. Charts use a sample of {len(df):,} rows.")
 
         # Display the dataset
         st.subheader("Dataset Preview")
-        st.write(df.head())
+        st.write(dataset.head())
 
         # Dataset information
         st.subheader("Dataset Information")
-        st.write("Shape of dataset:", df.shape)
-        st.write("Columns:", df.columns.tolist())
+        st.write("Shape of dataset:", (profile.rows, len(profile.columns)))
+        st.write("Columns:", dataset.columns)
         st.write("Missing values:")
-        st.write(df.isnull().sum())
+        st.write(profile.null_counts())
         st.write("Data types:")
-        st.write(df.dtypes)
+        st.write(dataset.dtypes)
+        st.write("Distinct and most common values:")
+        st.write(profile.overview())
 
         # Summary statistics
         st.subheader("Summary Statistics")
-        st.write(df.describe())
+        st.write(profile.describe())
+        st.caption("Quartiles and distinct counts are approximate for large datasets.")
 
         # Data visualization options
         st.sidebar.header("Visualization")
         if st.sidebar.checkbox("Show correlation heatmap"):
             st.subheader("Correlation Heatmap")
-            plt.figure(figsize=(10, 6))
-            sns.heatmap(df.corr(), annot=True, cmap="coolwarm")
-            st.pyplot(plt)
+            st.caption("Pearson correlation between the numeric columns.")
+            show_figure(pending, get_figures().heatmap(dataset), "Rendering the correlation heatmap...")
 
         if st.sidebar.checkbox("Show column distributions"):
             st.subheader("Column Distributions")
-            selected_column = st.sidebar.selectbox("Select a column", df.select_dtypes(include=np.number).columns)
+            selected_column = st.sidebar.selectbox("Select a column", profile.numeric_columns())
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
             plt.figure(figsize=(8, 4))
             sns.histplot(df[selected_column], kde=True, bins=30)
             plt.title(f"Distribution of {selected_column}")
@@ -52,11 +134,14 @@ def home_page():
 
         # Interactive data filtering
         st.sidebar.header("Filter Data")
-        filter_column = st.sidebar.selectbox("Select a column for filtering", df.columns)
-        unique_values = df[filter_column].unique()
-        filter_value = st.sidebar.selectbox("Select a value", unique_values)
-        filtered_df = df[df[filter_column] == filter_value]
-        st.subheader(f"Filtered Data ({filter_column} = {filter_value})")
+        filter_columns = st.sidebar.multiselect("Select columns for filtering", dataset.columns, default=dataset.columns[:1])
+        predicates = [filter_predicate(dataset, filter_column) for filter_column in filter_columns]
+        # Each predicate is a lookup in a per-column index; the results are intersected
+        positions = query(dataset, predicates)
+        filtered_df = dataset.take(positions)
+        st.subheader(f"Filtered Data ({' and '.join(describe_predicate(*p) for p in predicates) or 'all rows'})")
+        if len(positions) > len(filtered_df):
+            st.caption(f"Showing the first {len(filtered_df):,} of {len(positions):,} matching rows")
         st.write(filtered_df)
 
         # Advanced analyses
@@ -66,39 +151,46 @@ def home_page():
         if st.sidebar.checkbox("Show pairplot"):
             st.subheader("Pairplot")
             st.text("Visualizing relationships between numerical columns")
-            selected_columns = st.sidebar.multiselect("Select columns for pairplot", df.select_dtypes(include=np.number).columns, default=df.select_dtypes(include=np.number).columns[:2])
+            selected_columns = st.sidebar.multiselect("Select columns for pairplot", profile.numeric_columns(), default=profile.numeric_columns()[:2], max_selections=MAX_PAIRPLOT_COLUMNS)
+            sample_size = st.sidebar.number_input("Pairplot sample size", min_value=100, max_value=100_000, value=PAIRPLOT_SAMPLE, step=500)
+            hue_columns = [name for name, column in profile.columns.items() if not column.numeric and column.distinct.estimate() <= MAX_HUE_VALUES]
+            hue = st.sidebar.selectbox("Color by (sampled per group)", ["(none)", *hue_columns])
+            hue = None if hue == "(none)" else hue
             if len(selected_columns) > 1:
-                sns.pairplot(df[selected_columns])
-                st.pyplot(plt)
+                st.caption(f"Drawn from a sample of up to {sample_size:,} of {profile.rows:,} rows.")
+                show_figure(pending, get_figures().pairplot(dataset, selected_columns, sample_size, hue), "Rendering the pairplot...")
             else:
                 st.warning("Please select at least two columns for the pairplot.")
 
         # Outlier detection
         if st.sidebar.checkbox("Detect Outliers"):
             st.subheader("Outlier Detection")
-            numeric_columns = df.select_dtypes(include=np.number).columns
+            numeric_columns = profile.numeric_columns()
             outlier_column = st.selectbox("Select a column for outlier detection", numeric_columns)
-            Q1 = df[outlier_column].quantile(0.25)
-            Q3 = df[outlier_column].quantile(0.75)
+            Q1, Q3 = profile.quantiles(outlier_column, (0.25, 0.75))
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
-            outliers = df[(df[outlier_column] < lower_bound) | (df[outlier_column] > upper_bound)]
-            st.write(f"Number of outliers in {outlier_column}: {len(outliers)}")
+            outliers, outlier_count = dataset.filter_outside(outlier_column, lower_bound, upper_bound)
+            st.write(f"Number of outliers in {outlier_column}: {outlier_count}")
             st.write(outliers)
 
         # Custom aggregation
         if st.sidebar.checkbox("Custom Aggregation"):
             st.subheader("Custom Aggregation")
-            agg_column = st.selectbox("Select a column for aggregation", df.columns)
+            agg_column = st.selectbox("Select a column for aggregation", dataset.columns)
             agg_function = st.selectbox("Select an aggregation function", ["mean", "sum", "count", "min", "max"])
-            grouped = df.groupby(agg_column).agg({agg_column: agg_function})
+            grouped = dataset.group_aggregate(agg_column, agg_function)
             st.write(grouped)
 
+        # Wait for background figures only after everything else on the page has been drawn
+        for placeholder, future in pending:
+            placeholder.image(future.result())
+
     except Exception as e:
         st.error(f"Error: {e}")
  else:
-     st.info("Please upload a CSV file to get started.")
+     st.info("Please upload a CSV file or pick a scraped table to get started.")
 
 def about_page():
     st.info("The **Dataset Analysis App** is a Streamlit-based interactive web application that allows users to upload and analyze datasets in CSV format. It provides comprehensive insights into the dataset, including statistical summaries, visualizations, and advanced analytical tools.")
@@ -107,6 +199,7 @@ def about_page():
 
 ### 1. **File Upload**
 - Users can upload datasets in CSV format via the sidebar.
+- Large CSVs can be opened by path on the server; files bigger than memory are converted to Parquet once and read from disk.
 
 ### 2. **Dataset Preview**
 - Display the first few rows of the dataset for a quick overview.
@@ -125,7 +218,8 @@ def about_page():
 - **Column Distributions**: View histograms with optional KDE (Kernel Density Estimation) for selected numerical columns.
 
 ### 6. **Interactive Data Filtering**
-- Filter data based on unique values in a selected column.
+- Filter on one or more columns by value, set of values, numeric range or missing values.
+- Values are searchable and paged by frequency, so high-cardinality columns stay responsive.
 
 ### 7. **Advanced Analyses**
 - **Pairplot**: Visualize relationships between selected numerical columns.
@@ -1,7 +1,4 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
 
 # Set page configuration
 st.set_page_config(
@@ -28,43 +25,58 @@ def home_page():
     st.markdown('<h1 class="main-header">📊 Data Analysis Web App</h1>', unsafe_allow_html=True)
     st.sidebar.header("Upload Your File")
     uploaded_file = st.sidebar.file_uploader("Upload a CSV File", type=["csv"])
-
-    if uploaded_file:
-        df = pd.read_csv(uploaded_file)
+    scraped_tables = st.session_state.get("datasets", {})
+    scraped_name = st.sidebar.selectbox("Or open a scraped table:", ["(none)", *scraped_tables]) if scraped_tables else "(none)"
+    # Loaded and profiled once per file content or scraped table, shared with the analysis page
+    dataset = None
+    if scraped_name != "(none)" or uploaded_file:
+        # pandas, pyarrow and matplotlib are imported with the first dataset rather than with the page
+        from charts import get_chart
+        from column_profile import get_profile
+        from datasets import get_datasets
+
+        if scraped_name != "(none)":
+            dataset = get_datasets().get(scraped_tables[scraped_name], scraped_name)
+        else:
+            dataset = get_datasets().load(uploaded_file)
+
+    if dataset is not None:
+        profile = get_profile(dataset)
         col1, col2, col3 = st.columns(3)
         col1.subheader("Header of the dataset")
-        col1.dataframe(df.head(), height=300)
+        col1.dataframe(dataset.head(), height=300)
         col2.subheader("Dataset Statistics")
-        col2.dataframe(df.describe())
+        col2.dataframe(profile.describe())
         col3.subheader("Tail of the Dataset")
-        col3.dataframe(df.tail(), height=300)
+        col3.dataframe(dataset.tail(), height=300)
         st.markdown("### Key Metrics")
         st.write("---")
-        total_rows = len(df)
-        total_columns = len(df.columns)
+        total_rows = profile.rows
+        total_columns = len(dataset.columns)
         st.columns(3)[1].metric("Total Rows", f"{total_rows}")
         st.columns(3)[2].metric("Total Columns", f"{total_columns}")
         st.markdown("### Visualization")
         st.write("---")
-        selected_column = st.selectbox("Select a column for visualization", df.columns)
+        selected_column = st.selectbox("Select a column for visualization", dataset.columns)
         chart_type = st.radio("Choose a chart type", ["Line Chart", "Bar Chart", "Area Chart", "Graphviz Chart", "Histogram", "Box Plot"])
         
-        if chart_type == "Line Chart":
-            st.line_chart(df[selected_column])
-        elif chart_type == "Bar Chart":
-            st.bar_chart(df[selected_column])
-        elif chart_type == "Area Chart":
-            st.area_chart(df[selected_column])
-        elif chart_type == "Graphviz Chart":
+        if chart_type == "Graphviz Chart":
             st.graphviz_chart(f'digraph {{ {selected_column} }}')
-        elif chart_type == "Histogram":
-            fig, ax = plt.subplots()
-            ax.hist(df[selected_column], bins=30)
-            st.pyplot(fig)
-        elif chart_type == "Box Plot":
-            fig, ax = plt.subplots()
-            ax.boxplot(df[selected_column])
-            st.pyplot(fig)
+        else:
+            # Series are downsampled and figures pre-rendered, then cached per (file, column, chart)
+            kind, chart = get_chart(dataset, selected_column, chart_type)
+            if kind == "message":
+                st.warning(chart)
+            elif kind == "png":
+                st.image(chart)
+            elif chart_type == "Line Chart":
+                st.line_chart(chart)
+            elif chart_type == "Bar Chart":
+                st.bar_chart(chart)
+            else:
+                st.area_chart(chart)
+            if kind == "frame" and len(chart) < total_rows and selected_column in profile.numeric_columns():
+                st.caption(f"Showing {len(chart):,} of {total_rows:,} points, downsampled to keep the chart's shape")
     else:
         st.markdown("### Please upload a CSV file to get started! 📂")
         st.image("https://via.placeholder.com/600x400?text=Upload+CSV", use_column_width=True)
@@ -0,0 +1,117 @@
+from importlib.util import find_spec
+
+PARSER_BACKENDS = ["html.parser", "lxml", "selectolax"]
+
+
+_backends = None
+
+
+def available_backends():
+    # Looked up without importing, so listing the backends does not load the parsers themselves
+    global _backends
+    if _backends is None:
+        _backends = ["html.parser"] + [name for name in ("lxml", "selectolax") if find_spec(name) is not None]
+    return list(_backends)
+
+
+def default_backend():
+    return "lxml" if "lxml" in available_backends() else "html.parser"
+
+
+def parse_html(html, backend="html.parser"):
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return SelectolaxNode(LexborHTMLParser(html).root)
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, backend)
+
+
+def _matches(node, names, attrs):
+    if names is not True and node.tag not in names:
+        return False
+    for key, expected in attrs.items():
+        value = node.attributes.get(key)
+        if key == "class":
+            if expected not in (value or "").split():
+                return False
+        elif expected is True:
+            if value is None and key not in node.attributes:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class SelectolaxNode:
+    # Exposes the small slice of the BeautifulSoup Tag API the scrape_* functions use,
+    # so every extractor runs unchanged on top of selectolax's C parser
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self):
+        return self.node.tag
+
+    @property
+    def text(self):
+        return self.node.text(deep=True)
+
+    @property
+    def children(self):
+        return [SelectolaxNode(node) for node in self.node.iter()]
+
+    @property
+    def body(self):
+        for node in self.node.traverse():
+            if node.tag == "body":
+                return SelectolaxNode(node)
+        return None
+
+    def get_text(self, separator="", strip=False):
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    def get(self, key, default=None):
+        attributes = self.node.attributes
+        if key not in attributes:
+            return default
+        value = attributes[key]
+        if value is None:
+            value = ""
+        if key == "class":
+            return value.split()
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def find_all(self, name=True, attrs=None, recursive=True, **kwargs):
+        names = name if name is True else ({name} if isinstance(name, str) else set(name))
+        attrs = dict(attrs or {}, **kwargs)
+        found = []
+        if recursive:
+            nodes = self.node.traverse()
+            # traverse() yields the starting node first; find_all only looks at descendants
+            next(nodes, None)
+        else:
+            nodes = self.node.iter()
+        for node in nodes:
+            if not node.tag or node.tag.startswith(("-", "_")):
+                continue
+            if _matches(node, names, attrs):
+                found.append(SelectolaxNode(node))
+        return found
+
+    def find(self, name=True, attrs=None, recursive=True, **kwargs):
+        found = self.find_all(name, attrs, recursive, **kwargs)
+        return found[0] if found else None
+
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
@@ -0,0 +1,58 @@
+import time
+
+READINESS_POLICIES = ["document ready", "network idle", "extractor selector"]
+DEFAULT_POLICY = "extractor selector"
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+NETWORK_IDLE_WINDOW = 0.5
+
+
+def _document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def _any_selector_present(selectors):
+    script = "return arguments[0].some(function (s) { return document.querySelector(s) !== null; });"
+
+    def condition(driver):
+        return driver.execute_script(script, list(selectors))
+    return condition
+
+
+def _network_idle(driver, deadline):
+    # No new resource timing entries for NETWORK_IDLE_WINDOW seconds after the load event
+    last_count = -1
+    quiet_since = time.perf_counter()
+    while time.perf_counter() < deadline:
+        if _document_ready(driver):
+            count = driver.execute_script("return performance.getEntriesByType('resource').length")
+            if count != last_count:
+                last_count = count
+                quiet_since = time.perf_counter()
+            elif time.perf_counter() - quiet_since >= NETWORK_IDLE_WINDOW:
+                return True
+        time.sleep(POLL_INTERVAL)
+    return False
+
+
+def wait_until_ready(driver, policy=DEFAULT_POLICY, selectors=(), timeout=DEFAULT_TIMEOUT):
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    start = time.perf_counter()
+    ready = True
+    try:
+        if policy == "network idle":
+            ready = _network_idle(driver, start + timeout)
+        elif policy == "extractor selector" and selectors:
+            # Any one selected extractor having something to read is enough
+            WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(_any_selector_present(selectors))
+        else:
+            # Also the fallback for "extractor selector" when no extractor names a selector
+            WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(_document_ready)
+    except TimeoutException:
+        ready = False
+    except WebDriverException:
+        # A page that navigates away mid-wait still leaves usable page_source behind
+        ready = False
+    return ready, time.perf_counter() - start
@@ -0,0 +1,109 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from instrumentation import span
+from extractors import assemble_results, compile_extractors, extract_buckets, restrict_dispatch
+from parsers import default_backend, parse_html
+
+MAX_PAGES = 16
+MAX_DOCUMENTS = 2
+MAX_RESULTS = 512
+MAX_URLS = 1024
+
+
+def content_digest(html):
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class _LRU:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.items = OrderedDict()
+
+    def get(self, key):
+        if key not in self.items:
+            return None
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+
+
+class ExtractionCache:
+    # Results are cached per extractor bucket (tables, links, one headline tag, ...), so enabling
+    # another extractor on a page we already have only walks the DOM for that bucket
+    def __init__(self, max_pages=MAX_PAGES, max_documents=MAX_DOCUMENTS, max_results=MAX_RESULTS, max_urls=MAX_URLS):
+        self.pages = _LRU(max_pages)
+        self.documents = _LRU(max_documents)
+        self.results = _LRU(max_results)
+        # url -> digest of its latest page; only a name, so it can outlive the page itself
+        self.latest = _LRU(max_urls)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "walks": 0}
+
+    def add_page(self, url, html, soup=None, parser=None):
+        parser = parser or default_backend()
+        digest = content_digest(html)
+        with self._lock:
+            self.pages.put(digest, html)
+            if soup is not None:
+                self.documents.put((digest, parser), soup)
+            self.latest.put(url, digest)
+        return digest
+
+    def digest_for(self, url):
+        with self._lock:
+            return self.latest.get(url)
+
+    def extract(self, digest, options, parser=None):
+        # Returns the same tuple as extract_page, or None when the page itself has been evicted
+        parser = parser or default_backend()
+        dispatch = compile_extractors(*options)
+        needed = {bucket for handlers in dispatch.values() for _, bucket in handlers}
+        # The lock covers lookups and inserts only; parsing and walking run outside it, so one
+        # session's slow page does not hold up every other session. Two sessions missing the
+        # same bucket at once both compute it, and the second insert wins.
+        with self._lock:
+            buckets = {}
+            for bucket in needed:
+                value = self.results.get((digest, parser, bucket))
+                if value is not None:
+                    buckets[bucket] = value
+            missing = needed - buckets.keys()
+            self.stats["hits"] += len(buckets)
+            self.stats["misses"] += len(missing)
+            if not missing:
+                return assemble_results(buckets, *options)
+            soup = self.documents.get((digest, parser))
+            html = self.pages.get(digest) if soup is None else None
+            if soup is None and html is None:
+                return None
+            self.stats["walks"] += 1
+        if soup is None:
+            with span("parse", backend=parser):
+                soup = parse_html(html, parser)
+        with span("extract", buckets=len(missing), cached=len(buckets)):
+            fresh = extract_buckets(soup, restrict_dispatch(dispatch, missing))
+        with self._lock:
+            self.documents.put((digest, parser), soup)
+            for bucket, value in fresh.items():
+                self.results.put((digest, parser, bucket), value)
+        buckets.update(fresh)
+        return assemble_results(buckets, *options)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+    return _cache
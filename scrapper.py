@@ -1,157 +1,256 @@
+import os
+import tracemalloc
+from urllib.parse import urlsplit
 import streamlit as st
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
-
-def get_driver():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-def scrape_wikipedia_data(url, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags):
-    driver = get_driver()
-    try:
-        driver.get(url)
-        time.sleep(2)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        driver.quit()
-
-        tables = scrape_tables(soup)
-        headlines = scrape_headlines_func(soup, scrape_headlines, selected_headlines_tags)
-        links = scrape_links_func(soup, scrape_links)
-        media = scrape_media_func(soup, scrape_media)
-        tags_data = scrape_tags_func(soup, scrape_tags)
-        p_tags_data = scrape_p_tags_func(soup, scrape_p_tags)
-
-        return tables, headlines, links, media, tags_data, p_tags_data, None
-    except Exception as e:
-        return None, None, None, None, None, None, f"Error occurred: {str(e)}"
-
-def scrape_tables(soup):
-    tables = soup.find_all("table", {"class": "wikitable"})
-    all_table_data = []
-    for i, table in enumerate(tables, 1):
-        st.write(f"Scraping Table {i}...")
-        rows = table.find_all("tr")
-        headers = [th.text.strip() for th in rows[0].find_all("th")]
-        data = [[col.text.strip() for col in row.find_all(["th", "td"])] for row in rows[1:]]
-        df = pd.DataFrame(data, columns=headers)
-        all_table_data.append(df)
-    if not tables:
-        st.warning("No tables found on this page.")
-    return all_table_data
-
-def scrape_headlines_func(soup, scrape_headlines, selected_headlines_tags):
-    if not scrape_headlines:
-        return []
-    headlines = []
-    for tag in selected_headlines_tags:
-        headline_tags = soup.find_all(tag)
-        headlines += [tag.text.strip() for tag in headline_tags]
-    return headlines
-
-def scrape_links_func(soup, scrape_links):
-    if not scrape_links:
-        return []
-    anchor_tags = soup.find_all("a", href=True)
-    return [a['href'] for a in anchor_tags if a['href'].startswith("http")]
-
-def scrape_media_func(soup, scrape_media):
-    if not scrape_media:
-        return {"images": [], "videos": [], "audios": []}
-    media = {
-        "images": [img['src'] for img in soup.find_all("img", src=True)],
-        "videos": [video['src'] for video in soup.find_all("video", src=True)],
-        "audios": [audio['src'] for audio in soup.find_all("audio", src=True)]
-    }
-    return media
-
-def scrape_tags_func(soup, scrape_tags):
-    if not scrape_tags:
-        return {}
-    tags_data = {}
-    for tag in scrape_tags:
-        tags = soup.find_all(tag)
-        tags_data[tag] = [t.text.strip() for t in tags]
-    return tags_data
-
-def scrape_p_tags_func(soup, scrape_p_tags):
-    if not scrape_p_tags:
-        return []
-    p_tags = soup.find_all("p")
-    return [p.text.strip() for p in p_tags]
-
-def start_scraping(url, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags):
+from core import crawl, scrape_urls, scrape_wikipedia_data
+from driver_pool import DEFAULT_PROFILE, RENDER_PROFILES, RESOURCE_TYPES, get_pool
+from fetcher import fetch_summary
+from readiness import DEFAULT_POLICY, DEFAULT_TIMEOUT, READINESS_POLICIES
+from parsers import available_backends, default_backend
+from result_cache import get_extraction_cache
+from page_cache import DEFAULT_TTL, get_cache
+from export import EXPORT_FORMATS, export_bundle
+from batch import FETCH_WORKERS, HOST_INTERVAL, RETRIES, parse_urls
+from crawler import MAX_DEPTH, MAX_PAGES
+from instrumentation import last_trace, stage_summary, to_jsonl, to_openmetrics
+from watch import check_page
+
+def start_scraping(url, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains=(), readiness=None, parser=None, use_cache=True, render_profile=None, cache_ttl=None):
     with st.spinner("Scraping in progress..."):
-        table_data, headlines, links, media, tags_data, p_tags_data, error = scrape_wikipedia_data(url, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+        table_data, *_, record, error = scrape_wikipedia_data(url, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains, readiness, parser, use_cache, render_profile, cache_ttl)
         if error:
+            st.session_state.pop("last_scrape", None)
             st.error(error)
         else:
+            # Results are rendered from the extraction cache on this and every later rerun
+            st.session_state["last_scrape"] = {"url": url, "parser": parser}
             st.success("Data scraped successfully!")
-            display_results(table_data, headlines, links, media, tags_data, p_tags_data)
-
-def display_results(table_data, headlines, links, media, tags_data, p_tags_data):
-    combined_data = {
-        "Tables": table_data,
-        "Headlines": headlines,
-        "Links": links,
-        "Images": media["images"],
-        "Videos": media["videos"],
-        "Audios": media["audios"],
-        "Tags": tags_data,
-        "P_Tags": p_tags_data
-    }
-
-    for i, df in enumerate(table_data, 1):
-        st.write(f"Table {i}:")
-        st.write(df)
-
-    if headlines:
-        st.write("Headlines Found:")
-        for headline in headlines:
-            st.write(f"- {headline}")
-
-    if links:
-        st.write("Links Found:")
-        for link in links:
-            st.write(f"- {link}")
-
-    if media["images"]:
-        st.write("Images Found:")
-        for img in media["images"]:
-            st.write(f"- {img}")
-
-    if media["videos"]:
-        st.write("Videos Found:")
-        for video in media["videos"]:
-            st.write(f"- {video}")
-
-    if media["audios"]:
-        st.write("Audios Found:")
-        for audio in media["audios"]:
-            st.write(f"- {audio}")
-
-    if tags_data:
-        st.write("Tags Found:")
-        for tag, texts in tags_data.items():
-            st.write(f"{tag}:")
-            for text in texts:
-                st.write(f"- {text}")
-
-    if p_tags_data:
-        st.write("P Tags Found:")
-        for p_text in p_tags_data:
-            st.write(f"- {p_text}")
-
-    combined_df = pd.DataFrame.from_dict(combined_data, orient='index').transpose()
-    csv_combined = combined_df.to_csv(index=False)
-    st.download_button(label="Download Combined Data CSV", data=csv_combined, file_name="scraped_data.csv", mime="text/csv")
-    
+            if not table_data:
+                st.warning("No tables found on this page.")
+            else:
+                register_tables(url, table_data)
+                st.caption(f"{len(table_data)} tables can be opened by name in the Analysis and Visualization pages.")
+            display_fetch_stats(record)
+            display_pool_stats(render_profile)
+        display_timing(last_trace())
+
+def register_tables(url, tables):
+    # Scraped tables are handed to the analysis pages through the dataset cache, not a CSV download
+    from datasets import get_datasets
+
+    registry = st.session_state.setdefault("datasets", {})
+    # Host, path and query, so pages that only share their last path segment keep separate entries
+    parts = urlsplit(url)
+    label = parts.netloc + parts.path.rstrip("/") + (f"?{parts.query}" if parts.query else "")
+    for i, table in enumerate(tables, 1):
+        name = f"{label} - table {i}"
+        registry[name] = get_datasets().register_frame(table, name)
+
+def display_cached_results(last_scrape, options):
+    cache = get_extraction_cache()
+    digest = cache.digest_for(last_scrape["url"])
+    results = cache.extract(digest, options, last_scrape["parser"]) if digest else None
+    if results is None:
+        st.info("The cached page has expired. Click \"Start Scraping\" to fetch it again.")
+        return
+    display_results(*results)
+    display_export([(last_scrape["url"], results)], "single")
+
+def start_batch_scraping(urls, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains=(), readiness=None, fetch_workers=FETCH_WORKERS, host_interval=HOST_INTERVAL, retries=RETRIES, parser=None, use_cache=True, render_profile=None, cache_ttl=None):
+    if not urls:
+        st.warning("Please provide at least one http(s) URL.")
+        return
+    options = (scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+    progress_bar = st.progress(0.0, text=f"Scraping 0/{len(urls)} pages...")
+
+    def progress(done, total, url):
+        progress_bar.progress(done / total, text=f"Scraping {done}/{total} pages... (last: {url})")
+
+    results = scrape_urls(urls, options, browser_domains, readiness, parser, progress, fetch_workers=fetch_workers, host_interval=host_interval, retries=retries, use_cache=use_cache, render_profile=render_profile, cache_ttl=cache_ttl)
+    st.session_state["batch_results"] = results
+    for url, entry in results.items():
+        if entry["result"]:
+            register_tables(url, entry["result"][0])
+    failed = sum(1 for r in results.values() if r["error"])
+    st.success(f"Scraped {len(urls) - failed} of {len(urls)} pages.")
+
+def start_crawl(seed, scope, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains=(), readiness=None, fetch_workers=FETCH_WORKERS, host_interval=HOST_INTERVAL, retries=RETRIES, parser=None, resume=True, use_cache=True, render_profile=None, cache_ttl=None):
+    if not seed.startswith(("http://", "https://")):
+        st.warning("Please enter an http(s) URL to start the crawl from.")
+        return
+    options = (scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+    progress_bar = st.progress(0.0, text="Crawling...")
+
+    def progress(done, total, url):
+        progress_bar.progress(min(done / total, 1.0), text=f"Crawled {done}/{total} pages... (last: {url})")
+
+    try:
+        results = crawl(seed, options, scope, browser_domains, readiness, parser, progress, resume, fetch_workers=fetch_workers, host_interval=host_interval, retries=retries, use_cache=use_cache, render_profile=render_profile, cache_ttl=cache_ttl)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    st.session_state["crawl_results"] = results
+    for url, entry in results.items():
+        if entry["result"]:
+            register_tables(url, entry["result"][0])
+    st.success(f"Crawl finished with {len(results)} pages visited.")
+
+def start_watch(urls, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains=(), readiness=None, parser=None, use_cache=True, render_profile=None, cache_ttl=None):
+    # One check per click; `python cli.py watch` runs the same check on a schedule
+    if not urls:
+        st.warning("Please provide at least one http(s) URL.")
+        return
+    options = (scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+    deltas = {}
+    with st.spinner("Checking for changes..."):
+        for url in urls:
+            try:
+                deltas[url] = check_page(url, options, browser_domains, readiness, parser, use_cache=use_cache, render_profile=render_profile, cache_ttl=cache_ttl)
+            except Exception as e:
+                deltas[url] = {"url": url, "error": str(e)}
+    st.session_state["watch_results"] = deltas
+
+def display_watch_results(deltas):
+    st.subheader("Changes since the last check")
+    for url, delta in deltas.items():
+        if delta.get("error"):
+            st.error(f"{url}: {delta['error']}")
+        elif delta.get("baseline"):
+            st.info(f"{url}: first check, {delta['sections']} sections recorded as the baseline")
+        elif not delta["changed"]:
+            st.caption(f"{url}: no changes")
+        else:
+            with st.expander(f"{url}: {len(delta['added_sections'])} sections added, {len(delta['removed_sections'])} removed, {len(delta['changed_sections'])} changed"):
+                st.json(delta["items"])
+
+def display_batch_results(results, title="Batch Results"):
+    import pandas as pd
+
+    rows = []
+    for url, entry in results.items():
+        fetch = entry["fetch"] or {}
+        row = {"URL": url, "Method": fetch.get("method"), "Latency (s)": round(fetch.get("latency", 0.0), 2), "Attempts": fetch.get("attempts"), "Error": entry["error"]}
+        if entry["result"]:
+            tables, headlines, links, media, tags_data, p_tags_data = entry["result"]
+            row.update({"Tables": len(tables), "Headlines": len(headlines), "Links": len(links), "Images": len(media["images"]), "Paragraphs": len(p_tags_data)})
+        rows.append(row)
+    st.subheader(title)
+    st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+    scraped = [url for url, entry in results.items() if entry["result"]]
+    if scraped:
+        display_export(((url, results[url]["result"]) for url in scraped), "batch")
+        selected_url = st.selectbox("Show results for:", scraped)
+        display_results(*results[selected_url]["result"], key="batch_results")
+
+def display_fetch_stats(record):
+    # The record comes from this session's own scrape; fetch_log is shared by every session
+    if record["cache"] == "hit":
+        st.caption(f"Served from the page cache in {record['latency'] * 1000:.0f}ms")
+    elif record["method"] == "browser":
+        status = "ready" if record["ready"] else "timed out"
+        st.caption(f"Rendered in the browser in {record['render']:.2f}s ({record['bytes'] / 1024:.0f} KB transferred), readiness wait {record['wait']:.2f}s ({status})")
+    else:
+        st.caption(f"Fetched over HTTP in {record['latency']:.2f}s")
+    summary = fetch_summary()
+    st.caption(f"Fetched via HTTP: {summary['http']} (avg {summary['avg_http']:.2f}s), via browser: {summary['browser']} (avg {summary['avg_browser']:.2f}s, {summary['avg_bytes'] / 1024:.0f} KB), browser time avoided: {summary['browser_time_avoided']:.1f}s")
+    display_cache_stats()
+
+def display_cache_stats():
+    cache = get_cache()
+    if not cache.enabled:
+        return
+    stats = cache.report()
+    st.caption(f"Page cache: {stats['hits']} hits, {stats['misses']} misses, {stats['revalidated']} revalidated (hit rate {stats['hit_rate']:.0%}), {stats['entries']} pages, {stats['size'] / 1024 / 1024:.1f} MB, {stats['evicted']} evicted")
+
+def display_pool_stats(render_profile=None):
+    stats = get_pool(render_profile).report()
+    st.caption(f"Browser pool: {stats['size']} warm, hit rate {stats['hit_rate']:.0%}, avg wait {stats['avg_wait']:.2f}s, recycled {stats['recycled']}, crashed {stats['crashed']}")
+
+def display_timing(trace):
+    import pandas as pd
+
+    if trace is None:
+        return
+    with st.expander(f"Timing breakdown ({trace['seconds']:.2f}s)"):
+        rows = [{
+            "stage": "\u2003" * s["depth"] + s["name"],
+            "ms": s["seconds"] * 1000,
+            "% of scrape": s["seconds"] / trace["seconds"] * 100 if trace["seconds"] else 0.0,
+            "blocks": s["blocks"],
+            "alloc KB": s["alloc_kb"],
+            "details": ", ".join(f"{k}={v}" for k, v in s.items() if k not in ("name", "depth", "seconds", "blocks", "alloc_kb")),
+        } for s in trace["spans"]]
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        summary = stage_summary()
+        if summary:
+            st.caption("Across all runs since the server started")
+            st.dataframe(pd.DataFrame(summary).T[["count", "p50", "p95", "p99", "mean"]], use_container_width=True)
+        col1, col2 = st.columns(2)
+        col1.download_button("Metrics (OpenMetrics)", to_openmetrics(), "scrape_metrics.txt", "text/plain")
+        col2.download_button("Traces (JSON lines)", to_jsonl(), "scrape_traces.jsonl", "application/x-ndjson")
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+def display_paginated(label, frame, key):
+    # Only the current page of rows is sent to the browser, however many items were extracted
+    import pandas as pd
+
+    query = st.text_input(f"Search {label.lower()}:", key=f"{key}_search")
+    if query:
+        mask = pd.Series(False, index=frame.index)
+        for i in range(frame.shape[1]):
+            mask |= frame.iloc[:, i].astype(str).str.contains(query, case=False, regex=False)
+        frame = frame[mask]
+    size_col, page_col = st.columns(2)
+    page_size = size_col.selectbox("Rows per page:", PAGE_SIZES, key=f"{key}_size")
+    pages = max(1, -(-len(frame) // page_size))
+    page = page_col.number_input(f"Page (of {pages}):", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    st.dataframe(frame.iloc[start:start + page_size], use_container_width=True)
+    st.caption(f"Showing {min(start + 1, len(frame))}-{min(start + page_size, len(frame))} of {len(frame)}")
+
+def display_results(table_data, headlines, links, media, tags_data, p_tags_data, key="results"):
+    import pandas as pd
+
+    categories = [(f"Table {i}", df) for i, df in enumerate(table_data, 1)]
+    categories += [
+        ("Headlines", pd.DataFrame({"Headline": headlines})),
+        ("Links", pd.DataFrame({"Link": links})),
+        ("Images", pd.DataFrame({"Image": media["images"]})),
+        ("Videos", pd.DataFrame({"Video": media["videos"]})),
+        ("Audios", pd.DataFrame({"Audio": media["audios"]})),
+        ("Tags", pd.DataFrame([(tag, text) for tag, texts in tags_data.items() for text in texts], columns=["Tag", "Text"])),
+        ("Paragraphs", pd.DataFrame({"Paragraph": p_tags_data})),
+    ]
+    categories = [(label, frame) for label, frame in categories if len(frame)]
+    if not categories:
+        st.info("Nothing was extracted with the selected options.")
+        return
+    tabs = st.tabs([f"{label} ({len(frame)})" for label, frame in categories])
+    for tab, (label, frame) in zip(tabs, categories):
+        with tab:
+            display_paginated(label, frame, f"{key}_{label.lower().replace(' ', '_')}")
+
+def display_export(pages, key):
+    # pages is an iterable of (url, results) consumed one page at a time by the export writer
+    st.subheader("Export")
+    export_format = st.selectbox("Export format:", EXPORT_FORMATS, key=f"{key}_format")
+    if st.button("Prepare Export", key=f"{key}_prepare"):
+        try:
+            with st.spinner("Writing export..."):
+                previous = st.session_state.pop(f"{key}_export", None)
+                if previous and os.path.exists(previous["path"]):
+                    os.remove(previous["path"])
+                st.session_state[f"{key}_export"] = {"format": export_format, "path": export_bundle(pages, export_format)}
+        except Exception as e:
+            st.error(f"Export failed: {e}")
+
+    prepared = st.session_state.get(f"{key}_export")
+    if prepared and prepared["format"] == export_format and os.path.exists(prepared["path"]):
+        with open(prepared["path"], "rb") as bundle:
+            st.download_button(label="Download Scraped Data (zip)", data=bundle, file_name="scraped_data.zip", mime="application/zip", key=f"{key}_download")
+
 
 st.title("Web Scrapper - Tools")
 st.write("Table, Headline, Link, Media, and Tag Scraper")
@@ -159,7 +258,30 @@ st.write("Table, Headline, Link, Media, and Tag Scraper")
 
 with st.sidebar:
     st.title("Web Scrapper - Tools")
-    url = st.text_input("Enter the URL:")
+    mode = st.radio("Mode", ["Single URL", "Batch", "Crawl", "Watch"], horizontal=True)
+    if mode == "Single URL":
+        url = st.text_input("Enter the URL:")
+    elif mode == "Crawl":
+        seed_url = st.text_input("Start crawling from:")
+        crawl_scope = {
+            "max_depth": st.slider("Max link depth:", 0, 10, MAX_DEPTH),
+            "max_pages": st.number_input("Max pages:", min_value=1, value=MAX_PAGES),
+            "same_domain": st.checkbox("Stay on the same domain", value=True),
+            "include": st.text_input("Only follow URLs matching (regex):"),
+            "exclude": st.text_input("Never follow URLs matching (regex):"),
+        }
+        resume_crawl = st.checkbox("Resume from the last checkpoint", value=True)
+    else:
+        urls_text = st.text_area("Enter URLs (one per line):")
+        urls_file = st.file_uploader("Or upload a URL list", type=["txt", "csv"])
+        if urls_file is not None:
+            urls_text += "\n" + urls_file.getvalue().decode("utf-8", errors="ignore")
+        batch_urls = parse_urls(urls_text)
+        st.caption(f"{len(batch_urls)} URLs queued")
+    if mode in ("Batch", "Crawl"):
+        fetch_workers = st.slider("Concurrent fetches:", 1, 16, FETCH_WORKERS)
+        host_interval = st.slider("Min seconds between requests to the same host:", 0.0, 5.0, HOST_INTERVAL, 0.1)
+        retries = st.slider("Retries per URL:", 0, 5, RETRIES)
     scrape_headlines = st.checkbox("Scrape Headlines")
     headline_tags = ["h1", "h2", "h3", "h4", "h5", "h6"]
     selected_headlines_tags = st.multiselect("Select headlines to scrape:", headline_tags)
@@ -167,9 +289,49 @@ with st.sidebar:
     scrape_media = st.checkbox("Scrape Media (Images, Videos, Audios)")
     scrape_tags = st.multiselect("Select tags to scrape:", ["p", "span", "div", "li", "ul", "ol", "a"])
     scrape_p_tags = st.checkbox("Scrape paragraph")
+    browser_domains_text = st.text_area("Always render these domains in the browser (one per line):")
+    browser_domains = [d.strip().lower() for d in browser_domains_text.splitlines() if d.strip()]
+    readiness_policy = st.selectbox("Wait for page readiness:", READINESS_POLICIES, index=READINESS_POLICIES.index(DEFAULT_POLICY))
+    readiness_timeout = st.slider("Readiness timeout (seconds):", 1, 60, DEFAULT_TIMEOUT)
+    readiness = {"policy": readiness_policy, "timeout": readiness_timeout}
+    profile_names = list(RENDER_PROFILES)
+    render_profile = dict(RENDER_PROFILES[st.selectbox("Browser render profile:", profile_names, index=profile_names.index(DEFAULT_PROFILE))])
+    render_profile["block_types"] = st.multiselect("Block resource types:", RESOURCE_TYPES, default=render_profile["block_types"])
+    render_profile["block_patterns"] = [p.strip() for p in st.text_area("Also block URL patterns (one per line, * wildcards):").splitlines() if p.strip()]
+    backends = available_backends()
+    parser = st.selectbox("HTML parser:", backends, index=backends.index(default_backend()))
+    # Both apply to this session's scrapes only; the cache itself is shared by every session and job,
+    # so clearing it is left to the operator (remove the .page_cache directory)
+    use_cache = st.checkbox("Use page cache", value=True)
+    cache_ttl = st.number_input("Cache TTL (seconds):", min_value=0, value=DEFAULT_TTL, step=60)
+    # Allocation sizes per stage need tracemalloc, which slows every allocation down while it runs
+    if st.checkbox("Trace memory allocations", value=tracemalloc.is_tracing()):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    elif tracemalloc.is_tracing():
+        tracemalloc.stop()
 
 if st.button("Start Scraping"):
-    start_scraping(url, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags)
+    if mode == "Single URL":
+        start_scraping(url, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains, readiness, parser, use_cache, render_profile, cache_ttl)
+    elif mode == "Watch":
+        start_watch(batch_urls, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains, readiness, parser, use_cache, render_profile, cache_ttl)
+    elif mode == "Crawl":
+        start_crawl(seed_url, crawl_scope, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains, readiness, fetch_workers, host_interval, retries, parser, resume_crawl, use_cache, render_profile, cache_ttl)
+    else:
+        start_batch_scraping(batch_urls, scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags, browser_domains, readiness, fetch_workers, host_interval, retries, parser, use_cache, render_profile, cache_ttl)
+
+if mode == "Single URL" and "last_scrape" in st.session_state:
+    display_cached_results(st.session_state["last_scrape"], (scrape_headlines, selected_headlines_tags, scrape_links, scrape_media, scrape_tags, scrape_p_tags))
+
+if mode == "Batch" and "batch_results" in st.session_state:
+    display_batch_results(st.session_state["batch_results"])
+
+if mode == "Watch" and "watch_results" in st.session_state:
+    display_watch_results(st.session_state["watch_results"])
+
+if mode == "Crawl" and "crawl_results" in st.session_state:
+    display_batch_results(st.session_state["crawl_results"], "Crawl Results")
 
 
 def about_page():
@@ -186,8 +348,8 @@ def about_page():
                 - Checkboxes and dropdown menus for selecting the type of data to scrape.
              
              - Interactive Display:
-                - Scraped data is displayed in a categorized and readable format.
-                - Option to download combined scraped data as a CSV file
+                - Scraped data is displayed in a categorized and readable format, as searchable, paginated tables.
+                - Option to export scraped data as CSV, JSONL or Parquet files, one file per category, bundled in a zip
         
         2. Data Extraction Capabilities:
             - **Tables:** Extracts and formats data from HTML tables with the class wikitable.
@@ -215,6 +377,9 @@ def about_page():
         2. Functions:
              - get_driver()
                 - Initializes a Selenium WebDriver with options for headless browsing, GPU acceleration, and sandboxing.
+
+             - get_pool()
+                - Keeps a bounded pool of warm headless browsers that are leased per scrape, reset between leases and recycled after repeated use or a crash.
              
              - scrape_tables(soup)
                 - Extracts data from HTML tables with the class wikitable and formats it as Pandas DataFrames.
@@ -237,8 +402,17 @@ def about_page():
              - start_scraping()
                 - Orchestrates the scraping process based on user input and invokes other functions.
 
+             - start_crawl()
+                - Follows links from a start page through a prioritized, de-duplicated frontier within depth, page and scope limits, checkpointing to disk so a crawl can resume.
+
+             - start_batch_scraping()
+                - Scrapes a list of URLs concurrently with per-host rate limits and retries, parsing pages in a process pool.
+
              - display_results()
-                - Displays the scraped data and provides a CSV download option.
+                - Displays the scraped data.
+
+             - display_export()
+                - Streams the scraped data to per-category CSV, JSONL or Parquet files and offers them as a zip download.
 
              - about_page()
                 - Shows a brief description of the project in the Streamlit app.
@@ -257,7 +431,7 @@ def about_page():
 
         4. View and Download Results:
             - Review the scraped data displayed in the app.
-            - Download the combined data as a CSV file if needed.
+            - Export the data as CSV, JSONL or Parquet files if needed.
              
 
         ##### Challenges and Solutions
@@ -0,0 +1,137 @@
+import warnings
+
+import pandas as pd
+
+MAX_SPAN = 1000
+NULL_MARKERS = ["", "—", "–", "-", "?", "N/A", "n/a", "NA", "TBD", "TBA"]
+FOOTNOTE = r"\[(?:\d+|[a-z]|note \d+|citation needed|nb \d+)\]"
+NUMBER_NOISE = r"[,\s  $€£¥%+]"
+CELL_TAGS = ("th", "td")
+# Values tried before a whole column goes through the (per-element, slow) date parser
+DATE_SAMPLE = 20
+INT_LIMIT = 2**53
+
+
+def _span(value):
+    if value is None:
+        return 1
+    span = int("".join(ch for ch in str(value) if ch.isdigit()) or 1)
+    return min(max(span, 1), MAX_SPAN)
+
+
+def table_grid(table):
+    # Dense grid with rowspan/colspan cells copied into every position they cover
+    grid = []
+    header_rows = 0
+    spans = {}
+    for tr in table.find_all("tr"):
+        row = []
+        col = 0
+        # Walking the row's children directly is much cheaper than find_all(recursive=False)
+        cells = [child for child in tr.children if child.name in CELL_TAGS]
+        for cell in cells:
+            col = _fill_spans(row, col, spans)
+            text = cell.get_text().strip()
+            rowspan = _span(cell.get("rowspan"))
+            for _ in range(_span(cell.get("colspan"))):
+                row.append(text)
+                if rowspan > 1:
+                    spans[col] = [rowspan - 1, text]
+                col += 1
+        while spans and col <= max(spans):
+            if col in spans:
+                col = _fill_spans(row, col, spans)
+            else:
+                row.append("")
+                col += 1
+        if not row:
+            continue
+        if len(grid) == header_rows and cells and all(cell.name == "th" for cell in cells):
+            header_rows += 1
+        grid.append(row)
+    return grid, header_rows
+
+
+def _fill_spans(row, col, spans):
+    while col in spans:
+        remaining, text = spans[col]
+        row.append(text)
+        if remaining == 1:
+            del spans[col]
+        else:
+            spans[col][0] = remaining - 1
+        col += 1
+    return col
+
+
+def _column_names(header, width):
+    names = []
+    seen = {}
+    for i in range(width):
+        parts = list(dict.fromkeys(part for part in (row[i] for row in header) if part))
+        name = " / ".join(parts) or f"Column {i + 1}"
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name} ({seen[name]})")
+    return names
+
+
+def _to_datetime(values):
+    with warnings.catch_warnings():
+        # pandas warns when it falls back to per-element parsing; mixed columns simply stay text
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.to_datetime(values, errors="coerce")
+
+
+def _parse_dates(cleaned, present):
+    # Labels such as "Row 12" contain digits too; rejecting them on a small sample keeps
+    # them away from dateutil, which would otherwise be tried on every cell
+    if _to_datetime(cleaned[present].head(DATE_SAMPLE)).isna().any():
+        return None
+    dates = _to_datetime(cleaned.where(present))
+    return dates if dates[present].notna().all() else None
+
+
+def infer_dtypes(df):
+    # Whole-column string ops and to_numeric/to_datetime instead of converting cell by cell
+    converted = {}
+    for i, name in enumerate(df.columns):
+        raw = df.iloc[:, i]
+        cleaned = raw.str.replace(FOOTNOTE, "", regex=True).str.strip()
+        present = ~cleaned.isin(NULL_MARKERS)
+        if not present.any():
+            converted[name] = raw
+            continue
+        numbers = pd.to_numeric(
+            cleaned.str.replace(NUMBER_NOISE, "", regex=True).str.replace("−", "-", regex=False),
+            errors="coerce",
+        )
+        if numbers[present].notna().all():
+            numbers = numbers.where(present)
+            values = numbers.dropna()
+            # Past 2**53 floats no longer hold every integer, so huge values keep float64
+            # rather than being cast (and wrapped around) into Int64
+            if (values % 1 == 0).all() and (values.abs() <= INT_LIMIT).all():
+                numbers = numbers.astype("Int64")
+            converted[name] = numbers
+            continue
+        if cleaned[present].str.contains(r"\d", regex=True).all():
+            dates = _parse_dates(cleaned, present)
+            if dates is not None:
+                converted[name] = dates
+                continue
+        converted[name] = raw
+    return pd.DataFrame(converted, index=df.index)
+
+
+def parse_table(table, typed=True):
+    grid, header_rows = table_grid(table)
+    if not grid:
+        return pd.DataFrame()
+    width = max(len(row) for row in grid)
+    header_rows = header_rows or 1
+    header = [row + [""] * (width - len(row)) for row in grid[:header_rows]]
+    body = [row + [""] * (width - len(row)) for row in grid[header_rows:]]
+    df = pd.DataFrame(body, columns=_column_names(header, width), dtype="string" if typed else object)
+    if typed and len(df):
+        df = infer_dtypes(df)
+    return df
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+from crawler import normalize_url, url_key
+from extractors import extract_page
+from fetcher import fetch_page, required_selectors
+from parsers import default_backend, parse_html
+
+WATCH_DIR = Path(__file__).resolve().parent / ".watch"
+WATCH_INTERVAL = 3600
+HEADINGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+LEAD = "(lead)"
+
+
+def fingerprint(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def content_root(soup):
+    # The article body on Wikipedia; elsewhere the body, unwrapped while it has a single child element
+    root = soup.select_one(".mw-parser-output") or soup.body or soup
+    while True:
+        elements = [child for child in root.children if getattr(child, "name", None)]
+        if len(elements) != 1 or elements[0].name in HEADINGS or elements[0].name == "table":
+            return root
+        root = elements[0]
+
+
+def split_sections(soup):
+    # Cuts the page into heading sections, with every wikitable as a section of its own.
+    # Returns [(key, html)] in page order; keys stay stable when unrelated sections change.
+    from bs4 import Comment
+
+    sections = []
+    seen = Counter()
+    title, parts, tables = LEAD, [], 0
+
+    def add(key, html):
+        seen[key] += 1
+        sections.append((key if seen[key] == 1 else f"{key} ({seen[key]})", html))
+
+    for child in content_root(soup).children:
+        name = getattr(child, "name", None)
+        if isinstance(child, Comment):
+            # Parser reports and cache timestamps live in comments and change on every render
+            continue
+        if name is None:
+            if str(child).strip():
+                parts.append(str(child))
+            continue
+        heading = child if name in HEADINGS else child.find(HEADINGS, recursive=False)
+        if heading is not None:
+            if parts:
+                add(title, "".join(parts))
+            title, parts, tables = heading.get_text(" ", strip=True) or name, [str(child)], 0
+        elif (name == "table" and "wikitable" in (child.get("class") or [])) or (name != "table" and child.find("table", {"class": "wikitable"})):
+            tables += 1
+            add(f"{title} / table {tables}", str(child))
+        else:
+            parts.append(str(child))
+    if parts:
+        add(title, "".join(parts))
+    return sections
+
+
+def section_items(html, options, parser):
+    tables, headlines, links, media, tags_data, p_tags_data = extract_page(parse_html(html, parser), *options)
+    return {
+        "tables": [{"columns": [str(c) for c in df.columns], "rows": df.astype(str).values.tolist()} for df in tables],
+        "headlines": headlines,
+        "links": links,
+        "media": media,
+        "tags": tags_data,
+        "paragraphs": p_tags_data,
+    }
+
+
+def _list_delta(before, after):
+    # Multiset difference, so a repeated link or paragraph is tracked per occurrence
+    old, new = Counter(before), Counter(after)
+    delta = {"added": list((new - old).elements()), "removed": list((old - new).elements())}
+    return {key: value for key, value in delta.items() if value}
+
+
+def _table_delta(before, after):
+    # Rows keyed by their first cell: present on both sides with other cells differing means changed
+    old_rows = Counter(tuple(row) for row in before["rows"])
+    new_rows = Counter(tuple(row) for row in after["rows"])
+    added = list((new_rows - old_rows).elements())
+    removed = list((old_rows - new_rows).elements())
+    removed_by_key = {row[0]: row for row in removed if row}
+    changed = []
+    for row in list(added):
+        if row and row[0] in removed_by_key:
+            previous = removed_by_key.pop(row[0])
+            removed.remove(previous)
+            added.remove(row)
+            changed.append({"before": list(previous), "after": list(row)})
+    delta = {"added_rows": [list(r) for r in added], "removed_rows": [list(r) for r in removed], "changed_rows": changed}
+    if before["columns"] != after["columns"]:
+        delta["columns"] = after["columns"]
+    return {key: value for key, value in delta.items() if value}
+
+
+def diff_items(before, after):
+    before = before or {}
+    after = after or {}
+    delta = {}
+    for kind in ("headlines", "links", "paragraphs"):
+        change = _list_delta(before.get(kind, []), after.get(kind, []))
+        if change:
+            delta[kind] = change
+    for kind in ("media", "tags"):
+        old, new = before.get(kind, {}), after.get(kind, {})
+        change = {key: _list_delta(old.get(key, []), new.get(key, [])) for key in dict.fromkeys([*old, *new])}
+        change = {key: value for key, value in change.items() if value}
+        if change:
+            delta[kind] = change
+    old_tables, new_tables = before.get("tables", []), after.get("tables", [])
+    tables = []
+    for index in range(max(len(old_tables), len(new_tables))):
+        old = old_tables[index] if index < len(old_tables) else {"columns": [], "rows": []}
+        new = new_tables[index] if index < len(new_tables) else {"columns": [], "rows": []}
+        change = _table_delta(old, new)
+        if change:
+            tables.append({"index": index, **change})
+    if tables:
+        delta["tables"] = tables
+    return delta
+
+
+class WatchState:
+    def __init__(self, url, directory=WATCH_DIR):
+        self.url = normalize_url(url)
+        self.path = Path(directory) / f"{url_key(self.url):016x}.json"
+        self.page = None
+        self.options = None
+        self.sections = {}
+        self.checked = None
+
+    def load(self):
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.page, self.options, self.sections, self.checked = state["page"], state["options"], state["sections"], state["checked"]
+        return self
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_suffix(".partial")
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump({"url": self.url, "page": self.page, "options": self.options, "sections": self.sections, "checked": self.checked}, f)
+        os.replace(partial, self.path)
+
+
+def check_page(url, options, browser_domains=(), readiness=None, parser=None, directory=WATCH_DIR, use_cache=True, render_profile=None, cache_ttl=None):
+    # Compares the page with the previous check and re-extracts only sections whose fingerprint moved.
+    # Returns a delta; the first check of a page (or one with different options) is a baseline.
+    state = WatchState(url, directory).load()
+    options = list(options)
+    selectors = required_selectors(*options)
+    html, soup, record = fetch_page(url, selectors, browser_domains, readiness, parser, use_cache, render_profile, cache_ttl)
+    checked = time.time()
+    delta = {"url": url, "checked": checked, "previous": state.checked, "fetch": record["method"], "cache": record["cache"]}
+    baseline = state.options != json.loads(json.dumps(options))
+    page = fingerprint(html)
+    if not baseline and page == state.page:
+        state.checked = checked
+        state.save()
+        return {**delta, "changed": False}
+
+    # Watch mode needs str() of subtrees, which only the BeautifulSoup backends provide
+    backend = parser if parser in ("html.parser", "lxml") else default_backend()
+    if soup is None or backend != (parser or default_backend()):
+        soup = parse_html(html, backend)
+    sections = {}
+    added, removed, changed, items = [], [], [], {}
+    for key, section_html in split_sections(soup):
+        digest = fingerprint(section_html)
+        previous = None if baseline else state.sections.get(key)
+        if previous is not None and previous["fingerprint"] == digest:
+            sections[key] = previous
+            continue
+        extracted = section_items(section_html, options, backend)
+        sections[key] = {"fingerprint": digest, "items": extracted}
+        change = diff_items(previous["items"] if previous else None, extracted)
+        if previous is None:
+            added.append(key)
+        elif change:
+            # Markup-only edits update the fingerprint without being reported
+            changed.append(key)
+        if change:
+            items[key] = change
+    if not baseline:
+        for key in state.sections.keys() - sections.keys():
+            removed.append(key)
+            change = diff_items(state.sections[key]["items"], None)
+            if change:
+                items[key] = change
+
+    state.page, state.options, state.sections, state.checked = page, options, sections, checked
+    state.save()
+    if baseline:
+        return {**delta, "changed": False, "baseline": True, "sections": len(sections)}
+    return {**delta, "changed": bool(added or removed or changed), "added_sections": added, "removed_sections": removed,
+            "changed_sections": changed, "items": items}
+
+
+def run_watch(urls, options, interval=WATCH_INTERVAL, rounds=None, on_delta=None, browser_domains=(), readiness=None, parser=None):
+    # Checks every URL once per round; rounds=None keeps going until interrupted
+    completed = 0
+    while rounds is None or completed < rounds:
+        started = time.monotonic()
+        for url in urls:
+            try:
+                delta = check_page(url, options, browser_domains, readiness, parser)
+            except Exception as e:
+                delta = {"url": url, "checked": time.time(), "error": str(e)}
+            if on_delta:
+                on_delta(delta)
+        completed += 1
+        if rounds is None or completed < rounds:
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))